@@ -575,6 +575,9 @@ class InvoiceAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_related()
+
 
 @admin.register(InvoiceItem)
 class InvoiceItemAdmin(admin.ModelAdmin):
@@ -626,6 +629,9 @@ class PaymentAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_related()
+
 
 @admin.register(PaymentSplit)
 class PaymentSplitAdmin(admin.ModelAdmin):
@@ -635,6 +641,9 @@ class PaymentSplitAdmin(admin.ModelAdmin):
     ordering = ('-created_at',)
     readonly_fields = ('created_at', 'updated_at', 'voided_at')
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_related()
+
 
 admin.site.site_header = "Dorotheo Dental Clinic - Administration"
 admin.site.site_title = "Dental Clinic Admin"
@@ -679,7 +679,7 @@ def get_inventory_summary(clinic_id=None):
     )['total']
 
     # Low stock items (quantity <= min_stock)
-    low_stock_qs = inv_qs.filter(quantity__lte=F('min_stock'))
+    low_stock_qs = inv_qs.low_stock()
     low_stock_count = low_stock_qs.count()
 
     low_stock_items = [
@@ -29,6 +29,12 @@ class ApiConfig(AppConfig):
             # Don't raise - allow app to start even if signals fail
             # This prevents the entire application from crashing
 
+        try:
+            from api.serializers import install_model_field_cache
+            install_model_field_cache()
+        except Exception as e:
+            logger.error(f"Failed to install serializer field cache: {e}")
+
         # Run system validation (environment, DB, RAG index)
         try:
             from api.services.system_validation import validate_environment
@@ -105,67 +105,27 @@ def calculate_invoice_totals(service_charge, items):
     }
 
 
-def update_patient_balance(patient_id, invoice_amount, operation='add'):
+def refresh_patient_balance(patient_id):
     """
-    Update or create patient balance record
+    Recompute a patient's cached balance from their invoices and payments.
     
-    Args:
-        patient_id (int): ID of the patient
-        invoice_amount (Decimal): Amount to add or subtract
-        operation (str): 'add' to add invoice, 'subtract' to remove invoice
-    
-    Returns:
-        PatientBalance: Updated or created patient balance instance
-    """
-    from api.models import PatientBalance, User
-    
-    patient = User.objects.get(id=patient_id)
-    
-    # Get or create patient balance record
-    balance, created = PatientBalance.objects.get_or_create(
-        patient=patient,
-        defaults={
-            'total_invoiced': Decimal('0.00'),
-            'total_paid': Decimal('0.00'),
-            'current_balance': Decimal('0.00'),
-        }
-    )
-    
-    invoice_amount = Decimal(str(invoice_amount))
-    
-    if operation == 'add':
-        # Adding a new invoice
-        balance.total_invoiced += invoice_amount
-        balance.current_balance += invoice_amount
-        balance.last_invoice_date = date.today()
-    elif operation == 'subtract':
-        # Removing/cancelling an invoice
-        balance.total_invoiced -= invoice_amount
-        balance.current_balance -= invoice_amount
-        # Note: We don't update last_invoice_date when removing
-    
-    balance.save()
-    return balance
-
-
-def record_payment(patient_id, payment_amount):
-    """
-    Record a payment from patient and update their balance
+    Replaces the old read-modify-write increments: the totals are derived in a
+    single UPDATE with correlated subqueries, so concurrent invoice/payment
+    writes cannot lose an update and the record never drifts from the source rows.
+    Cancelled invoices and voided payments are excluded.
     
     Args:
         patient_id (int): ID of the patient
-        payment_amount (Decimal): Amount paid by patient
     
     Returns:
-        PatientBalance: Updated patient balance instance
+        PatientBalance: Refreshed patient balance instance
     """
-    from api.models import PatientBalance, User
-    
-    patient = User.objects.get(id=patient_id)
+    from django.db.models import DecimalField, Max, OuterRef, Subquery, Sum, Value
+    from django.db.models.functions import Coalesce
+    from api.models import Invoice, PatientBalance, Payment
     
-    # Get or create patient balance record
     balance, created = PatientBalance.objects.get_or_create(
-        patient=patient,
+        patient_id=patient_id,
         defaults={
             'total_invoiced': Decimal('0.00'),
             'total_paid': Decimal('0.00'),
@@ -173,14 +133,29 @@ def record_payment(patient_id, payment_amount):
         }
     )
     
-    payment_amount = Decimal(str(payment_amount))
-    
-    # Update paid amount and balance
-    balance.total_paid += payment_amount
-    balance.current_balance -= payment_amount
-    balance.last_payment_date = date.today()
-    
-    balance.save()
+    invoices = Invoice.objects.filter(
+        patient_id=OuterRef('patient_id')
+    ).exclude(status='cancelled').order_by().values('patient_id')
+    payments = Payment.objects.filter(
+        patient_id=OuterRef('patient_id'), is_voided=False
+    ).order_by().values('patient_id')
+    
+    def total(qs, field):
+        return Coalesce(
+            Subquery(qs.annotate(total=Sum(field)).values('total')),
+            Value(Decimal('0.00')),
+            output_field=DecimalField(max_digits=10, decimal_places=2),
+        )
+    
+    PatientBalance.objects.filter(pk=balance.pk).update(
+        total_invoiced=total(invoices, 'total_due'),
+        total_paid=total(payments, 'amount'),
+        current_balance=total(invoices, 'total_due') - total(payments, 'amount'),
+        last_invoice_date=Subquery(invoices.annotate(last=Max('invoice_date')).values('last')),
+        last_payment_date=Subquery(payments.annotate(last=Max('payment_date')).values('last')),
+        updated_at=timezone.now(),
+    )
+    balance.refresh_from_db()
     return balance
 
 
@@ -0,0 +1,31 @@
+"""
+Django management command to expire stale password reset tokens in bulk.
+
+Marks every unused token past its expires_at as used with a single UPDATE,
+which keeps the partial (is_used=False) token index small.
+
+Usage:
+    python manage.py expire_password_reset_tokens
+
+Schedule (Azure WebJob / cron):
+    Run hourly.
+"""
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.models import PasswordResetToken
+
+
+class Command(BaseCommand):
+    help = 'Mark expired, unused password reset tokens as used'
+
+    def handle(self, *args, **options):
+        expired = PasswordResetToken.objects.filter(
+            is_used=False,
+            expires_at__lt=timezone.now(),
+        ).update(is_used=True)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'expire_password_reset_tokens complete: {expired} tokens expired.')
+        )
@@ -15,7 +15,7 @@ import time
 import logging
 from django.core.management.base import BaseCommand
 from api.models import PageChunk, Service, ClinicLocation, User
-from api.rag.embedding_service import generate_embedding
+from api.rag.embedding_service import generate_embeddings_batch
 from django.db.models import Q
 
 logger = logging.getLogger('rag.indexer')
@@ -384,6 +384,7 @@ class Command(BaseCommand):
                 PageChunk.objects.filter(page_id=page_id).delete()
 
             chunk_index = 0
+            page_chunks = []  # (section_title, chunk_text) awaiting embedding
             for section in page.get('sections', []):
                 section_title = section.get('title', '')
                 text = section.get('text', '')
@@ -395,9 +396,8 @@ class Command(BaseCommand):
                 chunks = _split_into_chunks(text)
 
                 for chunk_text in chunks:
-                    token_count = _estimate_tokens(chunk_text)
-
                     if dry_run:
+                        token_count = _estimate_tokens(chunk_text)
                         self.stdout.write(
                             f"    [DRY-RUN] Chunk {chunk_index}: "
                             f"section='{section_title}' "
@@ -408,32 +408,36 @@ class Command(BaseCommand):
                         total_chunks += 1
                         continue
 
-                    # Generate embedding
-                    embedding = generate_embedding(chunk_text)
-                    if embedding:
-                        total_embedded += 1
-                    else:
-                        errors += 1
-                        self.stdout.write(
-                            self.style.WARNING(
-                                f"    ⚠ Failed to generate embedding for chunk {chunk_index}"
-                            )
-                        )
+                    page_chunks.append((section_title, chunk_text))
+
+            # Generate embeddings for the whole page in batched API calls
+            embeddings = generate_embeddings_batch([chunk_text for _, chunk_text in page_chunks])
 
-                    # Save chunk
-                    PageChunk.objects.create(
-                        page_id=page_id,
-                        chunk_text=chunk_text,
-                        embedding=embedding or None,
-                        page_title=page_title,
-                        section_title=section_title,
-                        source_url=source_url,
-                        chunk_index=chunk_index,
-                        token_count=token_count,
+            for (section_title, chunk_text), embedding in zip(page_chunks, embeddings):
+                if embedding:
+                    total_embedded += 1
+                else:
+                    errors += 1
+                    self.stdout.write(
+                        self.style.WARNING(
+                            f"    ⚠ Failed to generate embedding for chunk {chunk_index}"
+                        )
                     )
 
-                    chunk_index += 1
-                    total_chunks += 1
+                # Save chunk
+                PageChunk.objects.create(
+                    page_id=page_id,
+                    chunk_text=chunk_text,
+                    embedding=embedding or None,
+                    page_title=page_title,
+                    section_title=section_title,
+                    source_url=source_url,
+                    chunk_index=chunk_index,
+                    token_count=_estimate_tokens(chunk_text),
+                )
+
+                chunk_index += 1
+                total_chunks += 1
 
             self.stdout.write(f"    → {chunk_index} chunks indexed")
 
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-18 00:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0045_fix_pagechunk_embedding_nullable'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='appointment',
+            name='apt_completed_at_idx',
+        ),
+        migrations.AddIndex(
+            model_name='appointment',
+            index=models.Index(condition=models.Q(('status__in', ['confirmed', 'waiting', 'pending'])), fields=['clinic', 'date', 'time'], name='apt_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='appointment',
+            index=models.Index(condition=models.Q(('status', 'completed')), fields=['patient', '-completed_at'], name='apt_done_idx'),
+        ),
+    ]
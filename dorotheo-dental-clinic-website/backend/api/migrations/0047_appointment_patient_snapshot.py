@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-18 00:09
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Concat, Trim
+
+
+def backfill_patient_snapshot(apps, schema_editor):
+    """Copy each appointment's patient name/email into the new columns in one UPDATE."""
+    Appointment = apps.get_model('api', 'Appointment')
+    User = apps.get_model('api', 'User')
+    patient = User.objects.filter(pk=OuterRef('patient_id'))
+    Appointment.objects.update(
+        patient_full_name=Subquery(
+            patient.annotate(
+                full_name=Trim(Concat('first_name', Value(' '), 'last_name'))
+            ).values('full_name')[:1]
+        ),
+        patient_email=Subquery(patient.values('email')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0046_appointment_partial_status_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='appointment',
+            name='patient_email',
+            field=models.EmailField(blank=True, default='', editable=False, max_length=254),
+        ),
+        migrations.AddField(
+            model_name='appointment',
+            name='patient_full_name',
+            field=models.CharField(blank=True, default='', editable=False, max_length=301),
+        ),
+        migrations.RunPython(backfill_patient_snapshot, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 00:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0047_appointment_patient_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='passwordresettoken',
+            index=models.Index(condition=models.Q(('is_used', False)), fields=['user', 'expires_at'], name='token_active_idx'),
+        ),
+    ]
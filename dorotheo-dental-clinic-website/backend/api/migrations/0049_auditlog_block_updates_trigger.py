@@ -0,0 +1,54 @@
+"""
+Enforce AuditLog immutability inside the database.
+
+AuditLog.save() already rejects updates made through model instances, but
+QuerySet.update() and raw SQL bypass it. A BEFORE UPDATE trigger makes the
+table append-only for every client. DELETE is deliberately left alone so the
+cleanup_audit_logs retention command keeps working.
+
+PostgreSQL only — skipped on SQLite (local dev / tests), where the model
+guard remains the enforcement point.
+"""
+
+from django.db import migrations
+
+
+def _is_postgres(schema_editor):
+    return schema_editor.connection.vendor == 'postgresql'
+
+
+def create_trigger(apps, schema_editor):
+    if not _is_postgres(schema_editor):
+        return
+    schema_editor.execute("""
+        CREATE OR REPLACE FUNCTION audit_logs_block_update()
+        RETURNS trigger AS $$
+        BEGIN
+            RAISE EXCEPTION 'Audit logs cannot be modified after creation (HIPAA append-only)';
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    schema_editor.execute("""
+        DROP TRIGGER IF EXISTS audit_logs_no_update ON audit_logs;
+        CREATE TRIGGER audit_logs_no_update
+        BEFORE UPDATE ON audit_logs
+        FOR EACH ROW EXECUTE FUNCTION audit_logs_block_update();
+    """)
+
+
+def drop_trigger(apps, schema_editor):
+    if not _is_postgres(schema_editor):
+        return
+    schema_editor.execute("DROP TRIGGER IF EXISTS audit_logs_no_update ON audit_logs;")
+    schema_editor.execute("DROP FUNCTION IF EXISTS audit_logs_block_update();")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0048_passwordresettoken_active_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigger, drop_trigger),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-18 00:17
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0049_auditlog_block_updates_trigger'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='appointment',
+            name='dentist',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='dentist_appointments', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='appointment',
+            name='patient',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='appointments', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='is_active_patient',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='is_archived',
+            field=models.BooleanField(default=False),
+        ),
+    ]
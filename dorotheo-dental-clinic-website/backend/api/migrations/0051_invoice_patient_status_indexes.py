@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-18 00:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0050_drop_redundant_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['patient', 'status', '-due_date'], name='inv_pat_stat_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(condition=models.Q(('status__in', ['sent', 'overdue'])), fields=['patient', '-due_date'], name='inv_pat_unpaid_idx'),
+        ),
+    ]
@@ -0,0 +1,70 @@
+"""
+Enforce that a payment's non-voided splits never exceed the payment amount.
+
+PaymentSplit.save() used to run an aggregate query on every save, which made
+allocating K invoices O(K²) queries. Validation now happens once per payment in
+PaymentSplit.objects.create_splits() (and in clean() for the admin); this
+deferred constraint trigger keeps the invariant for bulk_create, update() and
+raw SQL, checked once at commit time.
+
+PostgreSQL only — skipped on SQLite (local dev / tests).
+"""
+
+from django.db import migrations
+
+
+def _is_postgres(schema_editor):
+    return schema_editor.connection.vendor == 'postgresql'
+
+
+def create_trigger(apps, schema_editor):
+    if not _is_postgres(schema_editor):
+        return
+    schema_editor.execute("""
+        CREATE OR REPLACE FUNCTION api_paymentsplit_check_total()
+        RETURNS trigger AS $$
+        DECLARE
+            split_total numeric;
+            payment_amount numeric;
+        BEGIN
+            SELECT COALESCE(SUM(amount), 0) INTO split_total
+            FROM api_paymentsplit
+            WHERE payment_id = NEW.payment_id AND is_voided = FALSE;
+
+            SELECT amount INTO payment_amount
+            FROM api_payment
+            WHERE id = NEW.payment_id;
+
+            IF split_total > payment_amount THEN
+                RAISE EXCEPTION 'Total payment splits (PHP %) cannot exceed payment amount (PHP %)',
+                    split_total, payment_amount;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    schema_editor.execute("""
+        DROP TRIGGER IF EXISTS paymentsplit_total_check ON api_paymentsplit;
+        CREATE CONSTRAINT TRIGGER paymentsplit_total_check
+        AFTER INSERT OR UPDATE ON api_paymentsplit
+        DEFERRABLE INITIALLY DEFERRED
+        FOR EACH ROW EXECUTE FUNCTION api_paymentsplit_check_total();
+    """)
+
+
+def drop_trigger(apps, schema_editor):
+    if not _is_postgres(schema_editor):
+        return
+    schema_editor.execute("DROP TRIGGER IF EXISTS paymentsplit_total_check ON api_paymentsplit;")
+    schema_editor.execute("DROP FUNCTION IF EXISTS api_paymentsplit_check_total();")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0051_invoice_patient_status_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigger, drop_trigger),
+    ]
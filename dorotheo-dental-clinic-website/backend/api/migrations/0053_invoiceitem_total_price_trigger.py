@@ -0,0 +1,61 @@
+"""
+Compute InvoiceItem.total_price inside the database.
+
+Django 4.2 has no GeneratedField, so a BEFORE INSERT OR UPDATE trigger plays
+the role of a stored generated column: total_price is always
+quantity * unit_price, including for bulk_create(), update() and raw SQL that
+never reach InvoiceItem.save().
+
+PostgreSQL only — skipped on SQLite (local dev / tests), where save() remains
+the only place the total is computed.
+"""
+
+from django.db import migrations
+
+
+def _is_postgres(schema_editor):
+    return schema_editor.connection.vendor == 'postgresql'
+
+
+def create_trigger(apps, schema_editor):
+    if not _is_postgres(schema_editor):
+        return
+    schema_editor.execute("""
+        CREATE OR REPLACE FUNCTION api_invoiceitem_set_total_price()
+        RETURNS trigger AS $$
+        BEGIN
+            NEW.total_price := NEW.quantity * NEW.unit_price;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    schema_editor.execute("""
+        DROP TRIGGER IF EXISTS invoiceitem_total_price ON api_invoiceitem;
+        CREATE TRIGGER invoiceitem_total_price
+        BEFORE INSERT OR UPDATE OF quantity, unit_price, total_price ON api_invoiceitem
+        FOR EACH ROW EXECUTE FUNCTION api_invoiceitem_set_total_price();
+    """)
+    # Repair any rows written out of sync before the trigger existed.
+    schema_editor.execute("""
+        UPDATE api_invoiceitem
+        SET total_price = quantity * unit_price
+        WHERE total_price IS DISTINCT FROM quantity * unit_price;
+    """)
+
+
+def drop_trigger(apps, schema_editor):
+    if not _is_postgres(schema_editor):
+        return
+    schema_editor.execute("DROP TRIGGER IF EXISTS invoiceitem_total_price ON api_invoiceitem;")
+    schema_editor.execute("DROP FUNCTION IF EXISTS api_invoiceitem_set_total_price();")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0052_paymentsplit_total_trigger'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigger, drop_trigger),
+    ]
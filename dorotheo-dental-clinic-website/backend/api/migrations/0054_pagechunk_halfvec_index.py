@@ -0,0 +1,64 @@
+"""
+Build the PageChunk similarity index over half-precision embeddings.
+
+The HNSW index from 0039 stores full float32 vectors. Indexing the expression
+embedding::halfvec(768) instead stores 2-byte floats, which halves the index
+size and the memory each search walks. Cosine ranking over 768-dim Gemini
+embeddings is unaffected at this precision. The table column itself stays
+vector(768).
+
+api.rag.vector_search_service casts the same way when halfvec is available,
+so the planner can use this index.
+
+Requires pgvector >= 0.7 (halfvec). On older pgvector — and on SQLite — this
+is a no-op and the original full-precision index is kept.
+"""
+
+from django.db import migrations
+
+EMBEDDING_DIM = 768
+
+
+def _is_postgres(schema_editor):
+    return schema_editor.connection.vendor == 'postgresql'
+
+
+def _has_halfvec(schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_type WHERE typname = 'halfvec'")
+        return cursor.fetchone() is not None
+
+
+def create_halfvec_index(apps, schema_editor):
+    if not _is_postgres(schema_editor) or not _has_halfvec(schema_editor):
+        return
+    schema_editor.execute(f"""
+        CREATE INDEX IF NOT EXISTS pagechunk_embedding_half_idx
+        ON api_pagechunk
+        USING hnsw ((embedding::halfvec({EMBEDDING_DIM})) halfvec_cosine_ops)
+        WITH (m = 16, ef_construction = 64);
+    """)
+    schema_editor.execute("DROP INDEX IF EXISTS pagechunk_embedding_cosine_idx;")
+
+
+def drop_halfvec_index(apps, schema_editor):
+    if not _is_postgres(schema_editor):
+        return
+    schema_editor.execute("""
+        CREATE INDEX IF NOT EXISTS pagechunk_embedding_cosine_idx
+        ON api_pagechunk
+        USING hnsw (embedding vector_cosine_ops)
+        WITH (m = 16, ef_construction = 64);
+    """)
+    schema_editor.execute("DROP INDEX IF EXISTS pagechunk_embedding_half_idx;")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0053_invoiceitem_total_price_trigger'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_halfvec_index, drop_halfvec_index),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.7 on 2026-10-18 00:53
+"""
+Replace the PageChunk created_at B-tree with a BRIN index on PostgreSQL.
+
+Chunks are written in page-sized batches by index_pages, so created_at follows
+the physical row order and a BRIN summary (a few pages) serves the same range
+scans as a B-tree that grows with every chunk. SQLite keeps no index on the
+column; nothing in the app filters by it there.
+"""
+
+from django.db import migrations
+
+
+def _is_postgres(schema_editor):
+    return schema_editor.connection.vendor == 'postgresql'
+
+
+def create_brin_index(apps, schema_editor):
+    if not _is_postgres(schema_editor):
+        return
+    schema_editor.execute("""
+        CREATE INDEX IF NOT EXISTS pagechunk_created_brin
+        ON api_pagechunk
+        USING brin (created_at);
+    """)
+
+
+def drop_brin_index(apps, schema_editor):
+    if not _is_postgres(schema_editor):
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS pagechunk_created_brin;")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0054_pagechunk_halfvec_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='pagechunk',
+            name='pagechunk_created_idx',
+        ),
+        migrations.RunPython(create_brin_index, drop_brin_index),
+    ]
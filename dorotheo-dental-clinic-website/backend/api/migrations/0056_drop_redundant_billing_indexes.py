@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-18 00:58
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0055_pagechunk_created_brin'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='invoice',
+            name='invoice_number',
+            field=models.CharField(help_text='Format: INV-YYYY-MM-NNNN', max_length=20, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='invoice',
+            name='patient',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='invoices', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='invoice',
+            name='reference_number',
+            field=models.CharField(help_text='Format: REF-NNNN', max_length=20, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='invoice',
+            name='status',
+            field=models.CharField(choices=[('draft', 'Draft'), ('sent', 'Sent'), ('paid', 'Paid'), ('overdue', 'Overdue'), ('cancelled', 'Cancelled')], default='draft', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='payment',
+            name='patient',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='payments', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='payment',
+            name='payment_number',
+            field=models.CharField(help_text='Format: PAY-YYYY-MM-NNNN', max_length=20, unique=True),
+        ),
+    ]
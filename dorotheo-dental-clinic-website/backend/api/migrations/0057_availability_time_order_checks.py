@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-18 01:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0056_drop_redundant_billing_indexes'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='blockedtimeslot',
+            constraint=models.CheckConstraint(check=models.Q(('end_time__gt', models.F('start_time'))), name='blocked_time_slot_time_order'),
+        ),
+        migrations.AddConstraint(
+            model_name='dentistavailability',
+            constraint=models.CheckConstraint(check=models.Q(('end_time__gt', models.F('start_time'))), name='dentist_availability_time_order'),
+        ),
+    ]
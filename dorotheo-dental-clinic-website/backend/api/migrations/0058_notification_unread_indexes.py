@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0057_availability_time_order_checks'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='appointmentnotification',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['recipient'], name='apt_notif_unread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dentistnotification',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['dentist'], name='dentist_notif_unread_idx'),
+        ),
+    ]
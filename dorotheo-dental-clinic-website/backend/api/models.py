@@ -1,4 +1,6 @@
-from django.db import models
+import os
+
+from django.db import models, transaction
 from django.contrib.auth.models import AbstractUser
 from django.core.exceptions import ValidationError
 from datetime import datetime, timedelta
@@ -26,8 +28,9 @@ class User(AbstractUser):
     birthday = models.DateField(null=True, blank=True)
     age = models.IntegerField(null=True, blank=True)
     profile_picture = models.ImageField(upload_to='profiles/', null=True, blank=True)
-    is_active_patient = models.BooleanField(default=True, db_index=True)
-    is_archived = models.BooleanField(default=False, db_index=True)  # For archiving patients
+    # Covered by the (user_type, ...) composite indexes below; no standalone index needed
+    is_active_patient = models.BooleanField(default=True)
+    is_archived = models.BooleanField(default=False)  # For archiving patients
     assigned_clinic = models.ForeignKey('ClinicLocation', on_delete=models.SET_NULL, null=True, blank=True, related_name='staff_members', help_text="Clinic where staff/dentist is currently assigned")
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -62,13 +65,13 @@ class User(AbstractUser):
             return
         
         try:
-            # Get last appointment
-            last_appointment = self.appointments.order_by('-date').first()
+            # Get last appointment date (scalar only, no model instantiation)
+            last_date = self.appointments.order_by('-date').values_list('date', flat=True).first()
             
-            if last_appointment:
+            if last_date:
                 # Calculate if last appointment was more than 2 years ago
                 two_years_ago = timezone.now().date() - timedelta(days=730)
-                if last_appointment.date < two_years_ago:
+                if last_date < two_years_ago:
                     self.is_active_patient = False
                 else:
                     self.is_active_patient = True
@@ -81,15 +84,55 @@ class User(AbstractUser):
             # If appointments relationship doesn't exist yet, keep as active
             self.is_active_patient = True
     
+    @classmethod
+    def refresh_all_patient_statuses(cls):
+        """
+        Set-based equivalent of update_patient_status() for every non-archived patient.
+        Runs two UPDATE statements driven by Exists() subqueries, so memory use does
+        not grow with the number of patients. Returns (activated, deactivated).
+        """
+        two_years_ago = timezone.now().date() - timedelta(days=730)
+
+        # Does this patient have a completed appointment within the last 730 days / ever?
+        recent_completed = Appointment.objects.filter(
+            patient=models.OuterRef('pk'),
+            status='completed',
+            date__gte=two_years_ago,
+        )
+        any_completed = Appointment.objects.filter(
+            patient=models.OuterRef('pk'),
+            status='completed',
+        )
+
+        # Patients with no completed appointments at all are intentionally excluded from
+        # deactivation to preserve the "new patient = active" behavior.
+        patient_qs = cls.objects.filter(user_type='patient', is_archived=False).annotate(
+            has_recent_appointment=models.Exists(recent_completed),
+            has_any_completed_appointment=models.Exists(any_completed),
+        )
+
+        activated = cls.objects.filter(
+            pk__in=patient_qs.filter(has_recent_appointment=True, is_active_patient=False).values('pk')
+        ).update(is_active_patient=True)
+
+        deactivated = cls.objects.filter(
+            pk__in=patient_qs.filter(
+                has_recent_appointment=False,
+                has_any_completed_appointment=True,
+                is_active_patient=True,
+            ).values('pk')
+        ).update(is_active_patient=False)
+
+        return activated, deactivated
+
     def get_last_appointment_date(self):
         """Get the date of the last completed appointment"""
         try:
             # Get completed appointments ordered by completion time (most recent first)
             # Use completed_at if available for accurate sorting, otherwise fallback to date+time
-            completed_appointments = self.appointments.filter(status='completed').order_by('-completed_at', '-date', '-time')
+            last_appointment = self.appointments.filter(status='completed').order_by('-completed_at', '-date', '-time').first()
             
-            if completed_appointments.exists():
-                last_appointment = completed_appointments.first()
+            if last_appointment:
                 # Return completed_at datetime if available for accurate sorting
                 if hasattr(last_appointment, 'completed_at') and last_appointment.completed_at:
                     return last_appointment.completed_at
@@ -102,6 +145,12 @@ class User(AbstractUser):
             return None
 
 
+class AuditLogManager(models.Manager):
+    """Default manager that joins actor/patient so listing logs avoids N+1 user lookups"""
+    def get_queryset(self):
+        return super().get_queryset().select_related('actor', 'patient_id')
+
+
 class AuditLog(models.Model):
     """
     HIPAA-compliant audit log model for tracking all access and modifications to patient data.
@@ -185,6 +234,8 @@ class AuditLog(models.Model):
         help_text="Optional justification for the action"
     )
     
+    objects = AuditLogManager()
+    
     class Meta:
         db_table = 'audit_logs'
         ordering = ['-timestamp']
@@ -210,6 +261,8 @@ class AuditLog(models.Model):
         """
         Override save to prevent updates to existing audit logs.
         Audit logs are append-only for HIPAA compliance.
+        On PostgreSQL a BEFORE UPDATE trigger (migration 0049) also blocks
+        QuerySet.update() and raw SQL, which bypass this method.
         """
         if self.pk is not None:
             raise ValidationError(
@@ -257,6 +310,50 @@ class Service(models.Model):
         return self.name
 
 
+def only_joined(queryset, *joined_fields):
+    """
+    Keep every column of the queryset's own model but only the named columns
+    of its select_related joins; joins that are not named stay fully loaded.
+    Meant for read-only list rendering.
+    """
+    own_fields = [f.name for f in queryset.model._meta.concrete_fields]
+    return queryset.only(*own_fields, *joined_fields)
+
+
+def user_name_fields(*relations):
+    """The columns get_full_name() reads, for each joined user relation."""
+    return [f'{relation}__{field}' for relation in relations for field in ('first_name', 'last_name')]
+
+
+class AppointmentQuerySet(models.QuerySet):
+    def with_related(self):
+        """
+        Join the relations AppointmentSerializer reads through source=.
+        The patient is not joined: list views use the denormalized
+        patient_full_name / patient_email columns. The reverse invoice is
+        only needed for its id, so it is annotated as linked_invoice_id
+        instead of being loaded as an Invoice instance.
+        """
+        return self.select_related(
+            'dentist', 'service', 'reschedule_service', 'reschedule_dentist',
+            'clinic', 'created_by'
+        ).annotate(linked_invoice_id=models.F('invoice__id'))
+
+    def for_list(self):
+        """
+        with_related() narrowed to the joined columns AppointmentSerializer
+        renders (get_full_name reads first_name/last_name), so the wide user
+        rows are not fetched three times per appointment. Read-only use only.
+        """
+        return only_joined(
+            self.with_related(),
+            *user_name_fields('dentist', 'reschedule_dentist', 'created_by'),
+            'created_by__user_type',
+            'service__name', 'service__color',
+            'reschedule_service__name',
+        )
+
+
 class Appointment(models.Model):
     STATUS_CHOICES = (
         ('pending', 'Pending'),
@@ -274,8 +371,9 @@ class Appointment(models.Model):
         ('ongoing', 'Ongoing'),
         ('done', 'Done'),
     )
-    patient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='appointments', db_index=True)
-    dentist = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='dentist_appointments', db_index=True)
+    # FK indexes are covered by apt_patient_status_date_idx / apt_dentist_date_idx
+    patient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='appointments', db_index=False)
+    dentist = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='dentist_appointments', db_index=False)
     service = models.ForeignKey(Service, on_delete=models.SET_NULL, null=True)
     clinic = models.ForeignKey('ClinicLocation', on_delete=models.CASCADE, related_name='appointments', null=True, blank=True, help_text="Clinic where appointment occurs")
     availability_slot = models.ForeignKey(
@@ -307,9 +405,15 @@ class Appointment(models.Model):
     # Track who created this appointment (patient, staff, or owner)
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='created_appointments', help_text="User who created this appointment")
     
+    # Denormalized patient details for list views (kept in sync by save() and the User post_save signal)
+    patient_full_name = models.CharField(max_length=301, blank=True, default='', editable=False)
+    patient_email = models.EmailField(blank=True, default='', editable=False)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = AppointmentQuerySet.as_manager()
+
     class Meta:
         ordering = ['-date', '-time']
         indexes = [
@@ -318,7 +422,18 @@ class Appointment(models.Model):
             models.Index(fields=['date', 'time']),
             # Additional indexes for performance optimization
             models.Index(fields=['patient', 'status', '-date'], name='apt_patient_status_date_idx'),
-            models.Index(fields=['status', '-completed_at'], name='apt_completed_at_idx'),
+            # Partial indexes for the hot status filters: active schedule lookups
+            # and "last completed visit" per patient (replaces apt_completed_at_idx)
+            models.Index(
+                fields=['clinic', 'date', 'time'],
+                name='apt_active_idx',
+                condition=models.Q(status__in=['confirmed', 'waiting', 'pending']),
+            ),
+            models.Index(
+                fields=['patient', '-completed_at'],
+                name='apt_done_idx',
+                condition=models.Q(status='completed'),
+            ),
             models.Index(fields=['dentist', 'date'], name='apt_dentist_date_idx'),
             # Booking safety indexes (from migration 0041)
             models.Index(fields=['dentist', 'date', 'time', 'status'], name='idx_apt_dentist_slot_status'),
@@ -333,7 +448,21 @@ class Appointment(models.Model):
         ]
 
     def __str__(self):
-        return f"{self.patient.get_full_name()} - {self.date} {self.time}"
+        return f"{self.patient_full_name} - {self.date} {self.time}"
+
+    def save(self, *args, **kwargs):
+        # Refresh the denormalized patient snapshot on full saves and on
+        # partial saves that write the patient; other partial saves (status
+        # changes, reminders) can't change it and skip the patient lookup.
+        # Name/email edits on the user are pushed by the User post_save receiver.
+        update_fields = kwargs.get('update_fields')
+        writes_patient = update_fields is None or not {'patient', 'patient_id'}.isdisjoint(update_fields)
+        if self.patient_id and writes_patient:
+            self.patient_full_name = self.patient.get_full_name()
+            self.patient_email = self.patient.email
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'patient_full_name', 'patient_email'}
+        super().save(*args, **kwargs)
 
 
 class DentalRecord(models.Model):
@@ -382,6 +511,12 @@ class Document(models.Model):
         return f"{self.title} - {self.patient.get_full_name()}"
 
 
+class InventoryItemQuerySet(models.QuerySet):
+    def low_stock(self):
+        """Items at or below their minimum stock, filtered in SQL (see is_low_stock)."""
+        return self.filter(quantity__lte=models.F('min_stock'))
+
+
 class InventoryItem(models.Model):
     name = models.CharField(max_length=200)
     category = models.CharField(max_length=100)
@@ -393,6 +528,8 @@ class InventoryItem(models.Model):
     clinic = models.ForeignKey('ClinicLocation', on_delete=models.CASCADE, null=True, blank=True, related_name='inventory_items', help_text="Clinic where this item is stored")
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = InventoryItemQuerySet.as_manager()
+
     def save(self, *args, **kwargs):
         # Auto-calculate total cost
         self.cost = self.unit_cost * self.quantity
@@ -564,11 +701,58 @@ class DentistAvailability(models.Model):
             models.Index(fields=['date']),
             models.Index(fields=['clinic', 'date']),
         ]
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(end_time__gt=models.F('start_time')),
+                name='dentist_availability_time_order',
+            ),
+        ]
 
     def __str__(self):
         clinic_str = f" at {self.clinic.name}" if self.clinic else " (all clinics)"
         return f"{self.dentist.get_full_name()} - {self.date} ({self.start_time} - {self.end_time}){clinic_str}"
 
+    UPSERT_FIELDS = ['start_time', 'end_time', 'is_available', 'apply_to_all_clinics']
+
+    @classmethod
+    def upsert_many(cls, dentist, entries):
+        """
+        Create or update one row per (date, clinic) for a dentist in batched
+        queries. Each entry is a dict with ``date``, ``clinic`` and the
+        UPSERT_FIELDS values; later entries for the same key win.
+        Returns the saved rows in input order. Bulk writes skip post_save,
+        so callers must clear the chatbot cache themselves.
+        """
+        date_field = cls._meta.get_field('date')
+        entries = [{**entry, 'date': date_field.to_python(entry['date'])} for entry in entries]
+        existing = {
+            (row.date, row.clinic_id): row
+            for row in cls.objects.select_related('dentist', 'clinic').filter(
+                dentist=dentist, date__in={entry['date'] for entry in entries}
+            )
+        }
+        now = timezone.now()
+        to_create, to_update, saved = {}, {}, []
+        for entry in entries:
+            clinic = entry['clinic']
+            key = (entry['date'], clinic.pk if clinic else None)
+            row = existing.get(key) or to_create.get(key)
+            if row is None:
+                row = to_create[key] = cls(dentist=dentist, date=entry['date'], clinic=clinic)
+            elif key in existing:
+                row.updated_at = now
+                to_update[key] = row
+            for field in cls.UPSERT_FIELDS:
+                setattr(row, field, entry[field])
+            saved.append(row)
+
+        with transaction.atomic():
+            cls.objects.bulk_create(to_create.values(), batch_size=500)
+            cls.objects.bulk_update(
+                to_update.values(), [*cls.UPSERT_FIELDS, 'updated_at'], batch_size=500
+            )
+        return saved
+
     def clean(self):
         from django.core.exceptions import ValidationError
         # Ensure end_time is after start_time
@@ -608,6 +792,12 @@ class BlockedTimeSlot(models.Model):
             models.Index(fields=['date', 'start_time', 'end_time']),
             models.Index(fields=['clinic', 'date']),
         ]
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(end_time__gt=models.F('start_time')),
+                name='blocked_time_slot_time_order',
+            ),
+        ]
 
     def __str__(self):
         clinic_str = f" at {self.clinic.name}" if self.clinic else " (all clinics)"
@@ -647,10 +837,30 @@ class AppointmentNotification(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Appointment Notification'
         verbose_name_plural = 'Appointment Notifications'
+        indexes = [
+            # unread_count is polled every 30s by the notification bell
+            models.Index(fields=['recipient'], name='apt_notif_unread_idx', condition=models.Q(is_read=False)),
+        ]
 
     def __str__(self):
         return f"{self.recipient.get_full_name()} - {self.get_notification_type_display()}"
 
+    @classmethod
+    def broadcast(cls, recipients, appointment, notification_type, message):
+        """Create the same notification for many recipients in batched INSERTs"""
+        return cls.objects.bulk_create(
+            [
+                cls(
+                    recipient=recipient,
+                    appointment=appointment,
+                    notification_type=notification_type,
+                    message=message,
+                )
+                for recipient in recipients
+            ],
+            batch_size=500,
+        )
+
 
 # Keep old model for backward compatibility during migration
 class DentistNotification(models.Model):
@@ -672,6 +882,10 @@ class DentistNotification(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Dentist Notification'
         verbose_name_plural = 'Dentist Notifications'
+        indexes = [
+            # unread_count is polled every 30s by the notification bell
+            models.Index(fields=['dentist'], name='dentist_notif_unread_idx', condition=models.Q(is_read=False)),
+        ]
 
     def __str__(self):
         return f"{self.dentist.get_full_name()} - {self.get_notification_type_display()}"
@@ -689,6 +903,11 @@ class PasswordResetToken(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Password Reset Token'
         verbose_name_plural = 'Password Reset Tokens'
+        indexes = [
+            # Only unused tokens are ever looked up; expired ones are swept by
+            # the expire_password_reset_tokens command
+            models.Index(fields=['user', 'expires_at'], name='token_active_idx', condition=models.Q(is_used=False)),
+        ]
 
     def is_valid(self):
         """Check if token is still valid"""
@@ -763,8 +982,17 @@ class FileAttachment(models.Model):
     
     def get_file_extension(self):
         """Get file extension"""
-        import os
         return os.path.splitext(self.file.name)[1].lower()
+    
+    def save(self, *args, **kwargs):
+        # A newly assigned file (not yet written to storage) always sets the
+        # size, replacing whatever was there; an already stored file keeps it
+        if self.file and not self.file._committed:
+            self.file_size = self.file.size
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'file_size'}
+        super().save(*args, **kwargs)
 
 
 class ClinicalNote(models.Model):
@@ -815,6 +1043,116 @@ class TreatmentAssignment(models.Model):
         return f"{self.treatment_name} - {self.patient.get_full_name()} - {self.status}"
 
 
+class InvoiceQuerySet(models.QuerySet):
+    def with_related(self):
+        """Preload the relations used by __str__, admin lists and billing views."""
+        return self.select_related(
+            'patient', 'clinic', 'created_by', 'appointment'
+        ).prefetch_related('items', 'payment_splits__payment')
+
+    def for_serializer(self, include_items=True):
+        """Join everything InvoiceSerializer reads, including the nested items."""
+        queryset = self.select_related(
+            'patient', 'clinic', 'created_by',
+            'appointment__service', 'appointment__dentist'
+        )
+        if include_items:
+            queryset = queryset.prefetch_related(
+                models.Prefetch('items', queryset=InvoiceItem.objects.select_related('inventory_item'))
+            )
+        return queryset
+
+    def for_list(self, include_items=True):
+        """
+        for_serializer() narrowed to the joined columns InvoiceSerializer
+        renders, so the patient, creator and dentist rows are not fetched
+        in full. Read-only use only.
+        """
+        return only_joined(
+            self.for_serializer(include_items=include_items),
+            *user_name_fields('patient', 'created_by', 'appointment__dentist'),
+            'patient__email',
+            'clinic__name',
+            'appointment__date', 'appointment__time',
+            'appointment__service', 'appointment__dentist',
+            'appointment__service__name',
+        )
+
+    def refresh_balances(self, invoice_ids):
+        """
+        Recompute amount_paid, balance, status and paid_at for the given invoices
+        with set-based UPDATEs instead of loading and saving each instance.
+
+        QuerySet.update() bypasses the Invoice audit signals, so every invoice
+        whose payment fields changed is logged here explicitly.
+        """
+        from decimal import Decimal
+        from django.db.models import Case, F, OuterRef, Q, Subquery, Value, When
+        from django.db.models.functions import Coalesce
+        from api.audit_service import create_audit_log
+
+        tracked_fields = ('amount_paid', 'balance', 'status', 'paid_at')
+        invoices = self.filter(pk__in=invoice_ids)
+        before = {row['id']: row for row in invoices.values('id', 'patient_id', *tracked_fields)}
+        if not before:
+            return 0
+
+        now = timezone.now()
+        split_total = PaymentSplit.objects.filter(
+            invoice=OuterRef('pk'),
+            is_voided=False,
+            payment__is_voided=False,
+        ).order_by().values('invoice').annotate(total=models.Sum('amount')).values('total')
+        invoices.update(
+            amount_paid=Coalesce(Subquery(split_total), Value(Decimal('0')), output_field=models.DecimalField()),
+        )
+
+        # Same transitions as update_payment_status() + save(); conditions see the pre-UPDATE status
+        fully_paid = Q(amount_paid__gte=F('total_due')) & ~Q(status='cancelled')
+        invoices.update(
+            balance=F('total_due') - F('amount_paid'),
+            status=Case(
+                When(fully_paid, then=Value('paid')),
+                When(status='paid', then=Value('sent')),
+                When(status='draft', amount_paid__gt=0, then=Value('sent')),
+                default=F('status'),
+            ),
+            paid_at=Case(
+                When(fully_paid, then=Coalesce(F('paid_at'), Value(now))),
+                When(status='paid', then=Value(None)),
+                default=F('paid_at'),
+                output_field=models.DateTimeField(),
+            ),
+            updated_at=now,
+        )
+
+        for row in invoices.values('id', 'patient_id', *tracked_fields):
+            old = before[row['id']]
+            changed = [field for field in tracked_fields if old[field] != row[field]]
+            if changed:
+                create_audit_log(
+                    actor=None,
+                    action_type='UPDATE',
+                    target_table='Invoice',
+                    target_record_id=row['id'],
+                    patient_id=row['patient_id'],
+                    changes={
+                        'before': {field: _audit_value(old[field]) for field in changed},
+                        'after': {field: _audit_value(row[field]) for field in changed},
+                    },
+                )
+        return len(before)
+
+
+def _audit_value(value):
+    """Match the string form audit signals use for Decimal/datetime values."""
+    if value is None or isinstance(value, str):
+        return value
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
 class Invoice(models.Model):
     """Invoice model for patient billing with itemized services and inventory items"""
     STATUS_CHOICES = (
@@ -826,12 +1164,12 @@ class Invoice(models.Model):
     )
     
     # Core Fields
-    invoice_number = models.CharField(max_length=20, unique=True, db_index=True, help_text="Format: INV-YYYY-MM-NNNN")
-    reference_number = models.CharField(max_length=20, unique=True, db_index=True, help_text="Format: REF-NNNN")
+    invoice_number = models.CharField(max_length=20, unique=True, help_text="Format: INV-YYYY-MM-NNNN")
+    reference_number = models.CharField(max_length=20, unique=True, help_text="Format: REF-NNNN")
     
     # Relationships
     appointment = models.OneToOneField(Appointment, on_delete=models.CASCADE, related_name='invoice')
-    patient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='invoices', db_index=True)
+    patient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='invoices', db_index=False)
     clinic = models.ForeignKey(ClinicLocation, on_delete=models.SET_NULL, null=True, related_name='invoices')
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='created_invoices')
     
@@ -846,7 +1184,7 @@ class Invoice(models.Model):
     balance = models.DecimalField(max_digits=10, decimal_places=2, help_text="Remaining balance (total_due - amount_paid)")
     
     # Status
-    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='draft', db_index=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='draft')
     
     # Dates
     invoice_date = models.DateField()
@@ -864,6 +1202,8 @@ class Invoice(models.Model):
     # PDF File
     pdf_file = models.FileField(upload_to='invoices/', null=True, blank=True)
 
+    objects = InvoiceQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Invoice'
@@ -872,6 +1212,14 @@ class Invoice(models.Model):
             models.Index(fields=['patient', '-created_at'], name='inv_patient_created_idx'),
             models.Index(fields=['status', '-due_date'], name='inv_status_due_idx'),
             models.Index(fields=['clinic', '-created_at'], name='inv_clinic_created_idx'),
+            # Per-patient status filters (balance checks, overdue totals) ordered by due date
+            models.Index(fields=['patient', 'status', '-due_date'], name='inv_pat_stat_due_idx'),
+            # Unpaid invoices only (sent/overdue) — small partial index for outstanding-balance lookups
+            models.Index(
+                fields=['patient', '-due_date'],
+                name='inv_pat_unpaid_idx',
+                condition=models.Q(status__in=['sent', 'overdue']),
+            ),
         ]
 
     def __str__(self):
@@ -885,25 +1233,44 @@ class Invoice(models.Model):
             payment__is_voided=False
         ).aggregate(total=models.Sum('amount'))['total'] or Decimal('0')
     
-    def update_payment_status(self):
-        """Update invoice payment status based on payment splits"""
-        self.amount_paid = self.calculate_amount_paid_from_splits()
+    def _recompute_derived(self):
+        """
+        Derive balance/status/paid_at from amount_paid.
+        Returns the names of the fields whose values changed.
+        """
+        before = (self.balance, self.status, self.paid_at)
         self.balance = self.total_due - self.amount_paid
         
-        # Update status
         if self.amount_paid >= self.total_due and self.status != 'cancelled':
             self.status = 'paid'
             if not self.paid_at:
                 self.paid_at = timezone.now()
-        elif self.amount_paid > 0 and self.amount_paid < self.total_due:
-            if self.status in ['draft', 'sent']:
-                self.status = 'sent'  # Keep as sent if partially paid
         elif self.status == 'paid' and self.amount_paid < self.total_due:
             # If amount_paid decreases and no longer covers total, revert from paid
             self.status = 'sent'
             self.paid_at = None
         
-        self.save()
+        after = (self.balance, self.status, self.paid_at)
+        return [name for name, old, new in zip(('balance', 'status', 'paid_at'), before, after) if old != new]
+    
+    def update_payment_status(self):
+        """
+        Update invoice payment status based on payment splits.
+        Saves only the fields that changed, and nothing if none did.
+        For several invoices at once use Invoice.objects.refresh_balances().
+        """
+        amount_paid = self.calculate_amount_paid_from_splits()
+        dirty = ['amount_paid'] if amount_paid != self.amount_paid else []
+        self.amount_paid = amount_paid
+        
+        # Keep as sent if partially paid
+        if 0 < self.amount_paid < self.total_due and self.status == 'draft':
+            self.status = 'sent'
+            dirty.append('status')
+        
+        dirty += [field for field in self._recompute_derived() if field not in dirty]
+        if dirty:
+            self.save(update_fields=dirty + ['updated_at'])
     
     def save(self, *args, **kwargs):
         # Auto-calculate subtotal (service + items)
@@ -916,18 +1283,8 @@ class Invoice(models.Model):
             self.interest_amount = 0
             self.total_due = self.subtotal
         
-        # Auto-calculate balance
-        self.balance = self.total_due - self.amount_paid
-        
-        # Auto-update status based on payment
-        if self.amount_paid >= self.total_due and self.status != 'cancelled':
-            self.status = 'paid'
-            if not self.paid_at:
-                self.paid_at = timezone.now()
-        elif self.status == 'paid' and self.amount_paid < self.total_due:
-            # If amount_paid decreases and no longer covers total, revert from paid
-            self.status = 'sent'
-            self.paid_at = None
+        # Auto-calculate balance and update status based on payment
+        self._recompute_derived()
         super().save(*args, **kwargs)
 
 
@@ -958,7 +1315,9 @@ class InvoiceItem(models.Model):
         return f"{self.item_name} (x{self.quantity}) - {self.invoice.invoice_number}"
     
     def save(self, *args, **kwargs):
-        # Auto-calculate total_price
+        # Auto-calculate total_price. On PostgreSQL the invoiceitem_total_price
+        # trigger (migration 0053) also derives it, covering bulk writes; this
+        # keeps the in-memory instance in sync and covers SQLite.
         self.total_price = self.quantity * self.unit_price
         super().save(*args, **kwargs)
 
@@ -982,6 +1341,16 @@ class PatientBalance(models.Model):
         return f"{self.patient.get_full_name()} - Balance: PHP {self.current_balance}"
 
 
+class PaymentQuerySet(models.QuerySet):
+    def with_related(self):
+        """Preload the relations used by __str__, admin lists and payment views."""
+        return self.select_related(
+            'patient', 'clinic', 'recorded_by', 'voided_by'
+        ).prefetch_related(
+            models.Prefetch('splits', queryset=PaymentSplit.objects.select_related('invoice', 'provider'))
+        )
+
+
 class Payment(models.Model):
     """Record of a payment made by a patient (cash, check, bank transfer, etc.)"""
     PAYMENT_METHOD_CHOICES = (
@@ -996,8 +1365,8 @@ class Payment(models.Model):
     )
     
     # Core Fields
-    payment_number = models.CharField(max_length=20, unique=True, db_index=True, help_text="Format: PAY-YYYY-MM-NNNN")
-    patient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='payments', db_index=True)
+    payment_number = models.CharField(max_length=20, unique=True, help_text="Format: PAY-YYYY-MM-NNNN")
+    patient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='payments', db_index=False)
     clinic = models.ForeignKey(ClinicLocation, on_delete=models.SET_NULL, null=True, related_name='payments')
     
     # Payment Details
@@ -1022,6 +1391,8 @@ class Payment(models.Model):
     voided_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='voided_payments')
     void_reason = models.TextField(blank=True, help_text="Reason for voiding the payment")
 
+    objects = PaymentQuerySet.as_manager()
+
     class Meta:
         ordering = ['-payment_date', '-created_at']
         verbose_name = 'Payment'
@@ -1038,6 +1409,12 @@ class Payment(models.Model):
     def get_allocated_amount(self):
         """Calculate total amount allocated to invoices"""
         from decimal import Decimal
+        # Sum prefetched splits (PaymentQuerySet.with_related) without a query
+        if 'splits' in getattr(self, '_prefetched_objects_cache', {}):
+            return sum(
+                (split.amount for split in self.splits.all() if not split.is_voided),
+                Decimal('0'),
+            )
         return self.splits.filter(is_voided=False).aggregate(
             total=models.Sum('amount')
         )['total'] or Decimal('0')
@@ -1050,6 +1427,39 @@ class Payment(models.Model):
         return self.amount - self.get_allocated_amount()
 
 
+class PaymentSplitQuerySet(models.QuerySet):
+    def with_related(self):
+        """Preload the payment/invoice shown by __str__ and the provider."""
+        return self.select_related('payment', 'invoice', 'provider')
+
+    def create_splits(self, payment, split_specs):
+        """
+        Validate and create all allocations of a payment at once.
+        split_specs is a list of dicts with invoice_id, amount and optional provider_id.
+        """
+        from django.core.exceptions import ValidationError
+        existing_total = payment.splits.filter(
+            is_voided=False
+        ).aggregate(total=models.Sum('amount'))['total'] or 0
+        new_total = sum(spec['amount'] for spec in split_specs)
+
+        if existing_total + new_total > payment.amount:
+            raise ValidationError(
+                f"Total payment splits (PHP {existing_total + new_total}) "
+                f"cannot exceed payment amount (PHP {payment.amount})"
+            )
+
+        return self.bulk_create([
+            PaymentSplit(
+                payment=payment,
+                invoice_id=spec['invoice_id'],
+                amount=spec['amount'],
+                provider_id=spec.get('provider_id'),
+            )
+            for spec in split_specs
+        ])
+
+
 class PaymentSplit(models.Model):
     """Allocation of a payment to a specific invoice"""
     
@@ -1069,6 +1479,8 @@ class PaymentSplit(models.Model):
     is_voided = models.BooleanField(default=False)
     voided_at = models.DateTimeField(null=True, blank=True)
 
+    objects = PaymentSplitQuerySet.as_manager()
+
     class Meta:
         ordering = ['created_at']
         verbose_name = 'Payment Split'
@@ -1080,9 +1492,11 @@ class PaymentSplit(models.Model):
     def __str__(self):
         return f"{self.payment.payment_number} → {self.invoice.invoice_number} - PHP {self.amount}"
     
-    def save(self, *args, **kwargs):
-        # Validate split amount doesn't exceed payment amount
-        if not self.is_voided:
+    def clean(self):
+        # Validate split amount doesn't exceed payment amount (admin / forms).
+        # Bulk allocation goes through PaymentSplit.objects.create_splits(), and
+        # on PostgreSQL a deferred constraint trigger (migration 0052) enforces it for every write.
+        if not self.is_voided and self.payment_id and self.amount is not None:
             payment = self.payment
             other_splits_total = payment.splits.exclude(id=self.id).filter(
                 is_voided=False
@@ -1094,8 +1508,6 @@ class PaymentSplit(models.Model):
                     f"Total payment splits (PHP {other_splits_total + self.amount}) "
                     f"cannot exceed payment amount (PHP {payment.amount})"
                 )
-        
-        super().save(*args, **kwargs)
 
 
 # ===========================================================================
@@ -1124,7 +1536,7 @@ class PageChunk(models.Model):
         verbose_name_plural = 'Page Chunks'
         indexes = [
             models.Index(fields=['page_id', 'chunk_index'], name='pagechunk_page_idx'),
-            models.Index(fields=['created_at'], name='pagechunk_created_idx'),
+            # created_at is indexed with BRIN on PostgreSQL (migration 0055)
         ]
 
     def __str__(self):
@@ -7,8 +7,9 @@ Includes caching to avoid redundant API calls.
 """
 
 import logging
+import threading
 import time
-import hashlib
+from collections import OrderedDict
 from functools import lru_cache
 from typing import List, Optional
 
@@ -24,23 +25,70 @@ logger = logging.getLogger('rag.embedding')
 # so we truncate to 768 via Matryoshka output_dimensionality.
 EMBEDDING_DIM = 768
 
-# In-memory embedding cache (query → embedding)
-_embedding_cache: dict = {}
+# In-memory LRU embedding cache (text → embedding), shared across request threads
+_embedding_cache: OrderedDict = OrderedDict()
+_cache_lock = threading.Lock()
 _CACHE_MAX_SIZE = 500
 
+# Separate LRU for user queries so re-indexing documents never evicts hot questions
+_query_cache: OrderedDict = OrderedDict()
+_QUERY_CACHE_MAX_SIZE = 512
+_QUERY_CACHE_MAX_CHARS = 512   # longer queries are rarely repeated; don't cache them
+_query_cache_stats = {'hits': 0, 'misses': 0}
+
+# Maximum texts per batch embedding request (Gemini batch limit)
+_BATCH_SIZE = 100
+
+# Gemini client is configured once per process (see _ensure_configured)
+_configured = False
+_configure_lock = threading.Lock()
+
 
 def _ensure_configured():
-    """Ensure Gemini API is configured. Reuses existing project setup."""
-    load_dotenv()
-    api_key = os.getenv('GEMINI_API_KEY')
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY not set")
-    genai.configure(api_key=api_key)
+    """
+    Ensure Gemini API is configured. Reuses existing project setup.
+    Runs load_dotenv()/genai.configure() only on the first successful call.
+    """
+    global _configured
+    if _configured:
+        return
+    with _configure_lock:
+        if _configured:
+            return
+        load_dotenv()
+        api_key = os.getenv('GEMINI_API_KEY')
+        if not api_key:
+            raise ValueError("GEMINI_API_KEY not set")
+        genai.configure(api_key=api_key)
+        _configured = True
 
 
 def _cache_key(text: str) -> str:
-    """Generate a cache key from text."""
-    return hashlib.md5(text.strip().lower().encode('utf-8')).hexdigest()
+    """
+    Generate a cache key from text.
+    The normalized text itself is the key: dict lookups hash it natively,
+    which is cheaper than running a digest over every chunk.
+    """
+    return text.strip().lower()
+
+
+def _cache_get(key: str, cache: OrderedDict = _embedding_cache) -> Optional[List[float]]:
+    """Return a cached embedding and mark it most recently used."""
+    with _cache_lock:
+        embedding = cache.get(key)
+        if embedding is not None:
+            cache.move_to_end(key)
+        return embedding
+
+
+def _cache_set(key: str, embedding: List[float], cache: OrderedDict = _embedding_cache,
+               max_size: int = _CACHE_MAX_SIZE) -> None:
+    """Store an embedding, evicting the least recently used entry when full (O(1))."""
+    with _cache_lock:
+        cache[key] = embedding
+        cache.move_to_end(key)
+        if len(cache) > max_size:
+            cache.popitem(last=False)
 
 
 def generate_embedding(text: str, use_cache: bool = True) -> Optional[List[float]]:
@@ -62,9 +110,10 @@ def generate_embedding(text: str, use_cache: bool = True) -> Optional[List[float
     # Check cache
     if use_cache:
         key = _cache_key(text)
-        if key in _embedding_cache:
-            logger.debug("Embedding cache hit for key=%s", key[:8])
-            return _embedding_cache[key]
+        cached = _cache_get(key)
+        if cached is not None:
+            logger.debug("Embedding cache hit")
+            return cached
 
     try:
         _ensure_configured()
@@ -82,12 +131,7 @@ def generate_embedding(text: str, use_cache: bool = True) -> Optional[List[float
 
         # Store in cache
         if use_cache:
-            if len(_embedding_cache) >= _CACHE_MAX_SIZE:
-                # Evict oldest quarter
-                keys = list(_embedding_cache.keys())
-                for k in keys[:_CACHE_MAX_SIZE // 4]:
-                    _embedding_cache.pop(k, None)
-            _embedding_cache[key] = embedding
+            _cache_set(key, embedding)
 
         return embedding
 
@@ -104,10 +148,14 @@ def generate_query_embedding(text: str) -> Optional[List[float]]:
         return None
 
     text = text.strip()
-    key = _cache_key(f"__query__{text}")
+    key = _cache_key(text) if len(text) <= _QUERY_CACHE_MAX_CHARS else None
 
-    if key in _embedding_cache:
-        return _embedding_cache[key]
+    if key is not None:
+        cached = _cache_get(key, _query_cache)
+        if cached is not None:
+            _query_cache_stats['hits'] += 1
+            return cached
+        _query_cache_stats['misses'] += 1
 
     try:
         _ensure_configured()
@@ -121,13 +169,13 @@ def generate_query_embedding(text: str) -> Optional[List[float]]:
         )
         embedding = result['embedding']
         elapsed = time.time() - start
-        logger.info("Generated query embedding (dim=%d) in %.2fs", len(embedding), elapsed)
+        logger.info(
+            "Generated query embedding (dim=%d) in %.2fs (query cache hits=%d misses=%d)",
+            len(embedding), elapsed, _query_cache_stats['hits'], _query_cache_stats['misses'],
+        )
 
-        if len(_embedding_cache) >= _CACHE_MAX_SIZE:
-            keys = list(_embedding_cache.keys())
-            for k in keys[:_CACHE_MAX_SIZE // 4]:
-                _embedding_cache.pop(k, None)
-        _embedding_cache[key] = embedding
+        if key is not None:
+            _cache_set(key, embedding, _query_cache, _QUERY_CACHE_MAX_SIZE)
 
         return embedding
 
@@ -139,9 +187,55 @@ def generate_query_embedding(text: str) -> Optional[List[float]]:
 def generate_embeddings_batch(texts: List[str]) -> List[Optional[List[float]]]:
     """
     Generate embeddings for multiple texts.
-    Falls back to one-by-one if batch API is unavailable.
+
+    Cache hits are served locally; misses are sent to Gemini in batches of
+    _BATCH_SIZE texts per request. Falls back to one-by-one calls if a batch
+    request fails.
     """
-    results = []
-    for text in texts:
-        results.append(generate_embedding(text, use_cache=True))
+    results: List[Optional[List[float]]] = [None] * len(texts)
+    miss_indices = {}  # cache key -> result indices sharing that text
+    misses = []        # (cache key, stripped text), one entry per unique text
+
+    for i, text in enumerate(texts):
+        if not text or not text.strip():
+            continue
+        text = text.strip()
+        key = _cache_key(text)
+        cached = _cache_get(key)
+        if cached is not None:
+            results[i] = cached
+        elif key in miss_indices:
+            miss_indices[key].append(i)
+        else:
+            miss_indices[key] = [i]
+            misses.append((key, text))
+
+    for offset in range(0, len(misses), _BATCH_SIZE):
+        batch = misses[offset:offset + _BATCH_SIZE]
+        try:
+            _ensure_configured()
+            start = time.time()
+
+            result = genai.embed_content(
+                model="models/gemini-embedding-001",
+                content=[text for _, text in batch],
+                task_type="RETRIEVAL_DOCUMENT",
+                output_dimensionality=EMBEDDING_DIM,
+            )
+            embeddings = result['embedding']
+            elapsed = time.time() - start
+            logger.info("Generated %d embeddings in one batch in %.2fs", len(embeddings), elapsed)
+
+            for (key, _), embedding in zip(batch, embeddings):
+                _cache_set(key, embedding)
+                for i in miss_indices[key]:
+                    results[i] = embedding
+
+        except Exception as e:
+            logger.warning("Batch embedding failed, falling back to per-item calls: %s", e)
+            for key, text in batch:
+                embedding = generate_embedding(text, use_cache=True)
+                for i in miss_indices[key]:
+                    results[i] = embedding
+
     return results
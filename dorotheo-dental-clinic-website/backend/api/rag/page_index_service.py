@@ -6,12 +6,15 @@ Internally orchestrates: query embedding → vector search → context building.
 All failures are caught and return None (safe fallback).
 """
 
+import hashlib
 import logging
 import time
 from typing import Optional, Tuple, List
 
 from django.conf import settings
+from django.core.cache import cache
 
+from .embedding_service import _cache_key
 from .vector_search_service import search_similar_chunks
 from .rag_context_builder import build_rag_context, extract_sources
 
@@ -32,6 +35,31 @@ def _max_tokens():
 def _is_enabled():
     return getattr(settings, 'RAG_ENABLED', True)
 
+def _cache_ttl():
+    return getattr(settings, 'RAG_CONTEXT_CACHE_TTL', 300)
+
+
+# ── Context cache ──────────────────────────────────────────────────────────
+# Uses Django's cache (Redis in production) so hits are shared across
+# gunicorn workers. Keys carry a generation number that PageChunk signals
+# bump, so re-indexing invalidates every cached context at once.
+
+_GENERATION_KEY = 'rag:context:generation'
+
+
+def _context_cache_key(kind: str, user_message: str) -> str:
+    generation = cache.get_or_set(_GENERATION_KEY, 1, timeout=None)
+    digest = hashlib.sha256(_cache_key(user_message).encode('utf-8')).hexdigest()
+    return f'rag:context:{generation}:{kind}:{digest}'
+
+
+def clear_context_cache():
+    """Invalidate all cached RAG contexts (called when PageChunks change)."""
+    try:
+        cache.incr(_GENERATION_KEY)
+    except ValueError:
+        cache.set(_GENERATION_KEY, 1, timeout=None)
+
 
 # ── Public API ─────────────────────────────────────────────────────────────
 
@@ -49,6 +77,13 @@ def get_context(user_message: str) -> Optional[str]:
     try:
         start = time.time()
 
+        key = _context_cache_key('context', user_message) if _cache_ttl() else None
+        if key:
+            cached = cache.get(key)
+            if cached is not None:
+                logger.debug("RAG context cache hit for: %s", user_message[:80])
+                return cached
+
         # 1. Vector search
         results = search_similar_chunks(
             query=user_message,
@@ -68,6 +103,8 @@ def get_context(user_message: str) -> Optional[str]:
 
         elapsed = time.time() - start
         if context:
+            if key:
+                cache.set(key, context, _cache_ttl())
             logger.info("RAG context retrieved in %.2fs (%d results)", elapsed, len(results))
         else:
             logger.debug("RAG: context builder returned None in %.2fs", elapsed)
@@ -92,6 +129,12 @@ def get_context_with_sources(
         return None, []
 
     try:
+        key = _context_cache_key('sources', user_message) if _cache_ttl() else None
+        if key:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
         results = search_similar_chunks(
             query=user_message,
             top_k=_top_k(),
@@ -107,6 +150,8 @@ def get_context_with_sources(
         )
         sources = extract_sources(results) if context else []
 
+        if key and context:
+            cache.set(key, (context, sources), _cache_ttl())
         return context, sources
 
     except Exception as e:
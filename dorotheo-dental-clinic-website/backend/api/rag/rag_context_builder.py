@@ -21,23 +21,28 @@ CHARS_PER_TOKEN = 4             # Rough approximation: 1 token ≈ 4 chars
 
 # ── Sanitization ───────────────────────────────────────────────────────────
 
+_CONTROL_CHARS_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]')
+
+# Prompt injection attempts, fused into one alternation so the text is scanned once
+_INJECTION_PATTERNS = [
+    r'ignore\s+previous\s+instructions',
+    r'ignore\s+all\s+instructions',
+    r'disregard\s+.*?instructions',
+    r'you\s+are\s+now\s+',
+    r'forget\s+everything',
+    r'system\s*:\s*',
+]
+_INJECTION_RE = re.compile('|'.join(f'(?:{p})' for p in _INJECTION_PATTERNS), re.IGNORECASE)
+
+
 def _sanitize_text(text: str) -> str:
     """Remove potentially harmful content from retrieved text before prompt injection."""
     if not text:
         return ''
     # Strip control characters
-    text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]', '', text)
+    text = _CONTROL_CHARS_RE.sub('', text)
     # Prevent prompt injection attempts
-    injection_patterns = [
-        r'ignore\s+previous\s+instructions',
-        r'ignore\s+all\s+instructions',
-        r'disregard\s+.*?instructions',
-        r'you\s+are\s+now\s+',
-        r'forget\s+everything',
-        r'system\s*:\s*',
-    ]
-    for pat in injection_patterns:
-        text = re.sub(pat, '[FILTERED]', text, flags=re.IGNORECASE)
+    text = _INJECTION_RE.sub('[FILTERED]', text)
     return text.strip()
 
 
@@ -46,6 +51,11 @@ def _estimate_tokens(text: str) -> int:
     return len(text) // CHARS_PER_TOKEN
 
 
+_CONTEXT_PREAMBLE = "Additional Knowledge Context:\n"
+_CONTEXT_FOOTER = "\n\nUse this context if relevant to the user's question."
+_WRAPPER_TOKENS = _estimate_tokens(_CONTEXT_PREAMBLE + _CONTEXT_FOOTER)
+
+
 # ── Public API ─────────────────────────────────────────────────────────────
 
 def build_rag_context(
@@ -76,8 +86,8 @@ def build_rag_context(
             if not text:
                 continue
 
-            # Deduplicate near-identical chunks
-            text_key = text[:200].lower()
+            # Deduplicate near-identical chunks (fixed-size hash of the prefix)
+            text_key = hash(text[:200].casefold())
             if text_key in seen_texts:
                 continue
             seen_texts.add(text_key)
@@ -118,15 +128,18 @@ def build_rag_context(
         if not context_parts:
             return None
 
-        # Assemble final context block
-        context = "Additional Knowledge Context:\n"
-        context += "\n---\n".join(context_parts)
-        context += "\n\nUse this context if relevant to the user's question."
+        # Assemble final context block in a single allocation
+        context = "".join((
+            _CONTEXT_PREAMBLE,
+            "\n---\n".join(context_parts),
+            _CONTEXT_FOOTER,
+        ))
 
+        # Token count tracked in the loop; no need to re-scan the assembled string
         logger.info(
             "Built RAG context: %d chunks, ~%d tokens, %d sources",
             len(context_parts),
-            _estimate_tokens(context),
+            max_tokens - token_budget + _WRAPPER_TOKENS,
             len(sources),
         )
 
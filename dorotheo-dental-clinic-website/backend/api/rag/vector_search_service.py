@@ -15,10 +15,13 @@ import logging
 import time
 from typing import List, Tuple, Optional
 
-from pgvector.django import CosineDistance
+from django.db import connection
+from django.db.models.functions import Cast
+from pgvector.django import CosineDistance, HalfVectorField
+from pgvector.utils import HalfVector
 
 from api.models import PageChunk
-from .embedding_service import generate_query_embedding
+from .embedding_service import EMBEDDING_DIM, generate_query_embedding
 
 logger = logging.getLogger('rag.vector_search')
 
@@ -28,6 +31,36 @@ DEFAULT_TOP_K = 5
 DEFAULT_SIMILARITY_THRESHOLD = 0.55   # Minimum cosine similarity to include
 
 
+# Whether the database supports halfvec (pgvector >= 0.7); checked once per process.
+_halfvec_available: Optional[bool] = None
+
+
+def _use_halfvec() -> bool:
+    """
+    True when similarity should be computed on half-precision vectors so the
+    halfvec HNSW index from migration 0054 is used.
+    """
+    global _halfvec_available
+    if _halfvec_available is None:
+        if connection.vendor != 'postgresql':
+            _halfvec_available = False
+        else:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM pg_type WHERE typname = 'halfvec'")
+                _halfvec_available = cursor.fetchone() is not None
+    return _halfvec_available
+
+
+def _cosine_distance(query_embedding: List[float]) -> CosineDistance:
+    """Cosine distance expression matching the PageChunk embedding index."""
+    if _use_halfvec():
+        return CosineDistance(
+            Cast('embedding', HalfVectorField(dimensions=EMBEDDING_DIM)),
+            HalfVector(query_embedding),
+        )
+    return CosineDistance('embedding', query_embedding)
+
+
 # ── Public API ─────────────────────────────────────────────────────────────
 
 def search_similar_chunks(
@@ -62,10 +95,15 @@ def search_similar_chunks(
         # 2. pgvector query — runs entirely in Postgres
         #    CosineDistance returns distance (0=identical, 2=opposite).
         #    similarity = 1 - distance  →  higher is better.
+        #    On pgvector >= 0.7 both sides are cast to halfvec so the
+        #    half-precision HNSW index (migration 0054) serves the query.
+        #    Only the text/metadata callers render is loaded: no 768 floats
+        #    per hit, and no timestamps/counters to hydrate.
         qs = (
             PageChunk.objects
             .filter(embedding__isnull=False)
-            .annotate(distance=CosineDistance('embedding', query_embedding))
+            .only('page_id', 'chunk_text', 'page_title', 'section_title', 'source_url')
+            .annotate(distance=_cosine_distance(query_embedding))
             .filter(distance__lte=1.0 - similarity_threshold)   # distance threshold
             .order_by('distance')
             [:top_k]
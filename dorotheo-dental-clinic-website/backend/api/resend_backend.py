@@ -4,6 +4,7 @@ This bypasses SMTP which is blocked on Railway free tier
 """
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor
 import resend
 from django.core.mail.backends.base import BaseEmailBackend
 from django.conf import settings
@@ -23,6 +24,9 @@ class ResendEmailBackend(BaseEmailBackend):
         resend.api_key = os.environ.get('RESEND_API_KEY', '')
         if not resend.api_key:
             logger.warning("RESEND_API_KEY not set in environment variables")
+        # Per-process constants, read once instead of on every message
+        self._default_from = settings.DEFAULT_FROM_EMAIL
+        self._test_override = os.environ.get('TEST_EMAIL_OVERRIDE', '')
 
     def send_messages(self, email_messages):
         """
@@ -32,17 +36,33 @@ class ResendEmailBackend(BaseEmailBackend):
         if not email_messages:
             return 0
 
-        sent_count = 0
-        for message in email_messages:
+        if len(email_messages) == 1:
             try:
-                sent = self._send(message)
-                if sent:
-                    sent_count += 1
+                return 1 if self._send(email_messages[0]) else 0
             except Exception as e:
                 logger.error(f"Failed to send email via Resend: {str(e)}")
                 if not self.fail_silently:
                     raise
+                return 0
 
+        # Independent HTTPS requests: overlap their latency with a bounded pool.
+        # Every message is attempted; the first failure is re-raised afterwards.
+        sent_count = 0
+        first_error = None
+        max_workers = max(1, min(getattr(settings, 'RESEND_MAX_CONCURRENCY', 2), len(email_messages)))
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(self._send, message) for message in email_messages]
+            for future in futures:
+                try:
+                    if future.result():
+                        sent_count += 1
+                except Exception as e:
+                    logger.error(f"Failed to send email via Resend: {str(e)}")
+                    if first_error is None:
+                        first_error = e
+
+        if first_error is not None and not self.fail_silently:
+            raise first_error
         return sent_count
 
     def _send(self, message):
@@ -51,10 +71,10 @@ class ResendEmailBackend(BaseEmailBackend):
             # Extract sender email from 'From' field
             from_email = message.from_email
             if not from_email:
-                from_email = settings.DEFAULT_FROM_EMAIL
+                from_email = self._default_from
 
             # Override recipients for testing (if TEST_EMAIL_OVERRIDE is set)
-            test_override = os.environ.get('TEST_EMAIL_OVERRIDE', '')
+            test_override = self._test_override
             recipients = [test_override] if test_override else message.to
             
             # Log original recipients if overriding
@@ -81,17 +101,14 @@ class ResendEmailBackend(BaseEmailBackend):
                 email_data["reply_to"] = message.reply_to[0]
 
             # Handle HTML and plain text content
-            if hasattr(message, 'alternatives') and message.alternatives:
-                # Has HTML content
-                for content, mimetype in message.alternatives:
-                    if mimetype == 'text/html':
-                        email_data["html"] = content
-                        break
-                # Plain text as fallback
-                if message.body:
-                    email_data["text"] = message.body
-            else:
-                # Plain text only
+            html_content = next(
+                (content for content, mimetype in getattr(message, 'alternatives', ()) if mimetype == 'text/html'),
+                None,
+            )
+            if html_content is not None:
+                email_data["html"] = html_content
+            # Plain text as fallback (or the only body when there is no HTML)
+            if message.body or html_content is None:
                 email_data["text"] = message.body
 
             # Handle file attachments (e.g. PDF invoices)
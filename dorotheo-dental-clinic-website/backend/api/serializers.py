@@ -1,6 +1,11 @@
+import copy
+
 from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.utils import timezone
-from datetime import timedelta
+from datetime import datetime, timedelta
 from .models import (
     User, Service, Appointment, DentalRecord, 
     Document, InventoryItem, Billing, ClinicLocation, 
@@ -14,11 +19,157 @@ from .models import (
 PATIENT_FULL_NAME = 'patient.get_full_name'
 CREATED_BY_FULL_NAME = 'created_by.get_full_name'
 
+# Patient age bounds for UserSerializer.validate_birthday, in days
+PATIENT_MIN_AGE_DAYS = 183     # ~6 months
+PATIENT_MAX_AGE_DAYS = 36525   # 100 years
+
+
+
+def install_model_field_cache():
+    """
+    Memoize ModelSerializer.get_fields per serializer class.
+
+    The model introspection behind get_fields depends only on the class and
+    its Meta, yet DRF repeats it for every serializer instance. The cached
+    fields are never bound; each instance gets a deep copy, the same way DRF
+    already copies _declared_fields. A shallow copy would share nested
+    ListSerializer children (and therefore their context) between requests.
+    Called once from ApiConfig.ready().
+    """
+    if getattr(serializers.ModelSerializer.get_fields, '_field_cache', None) is not None:
+        return
+
+    original_get_fields = serializers.ModelSerializer.get_fields
+    cache = {}
+
+    def get_fields(self):
+        cls = self.__class__
+        fields = cache.get(cls)
+        if fields is None:
+            fields = cache[cls] = original_get_fields(self)
+        return copy.deepcopy(fields)
+
+    get_fields._field_cache = cache
+    serializers.ModelSerializer.get_fields = get_fields
+
+
+def absolute_media_url(serializer, url):
+    """
+    Make a storage URL absolute for API consumers.
+
+    The request's scheme+host is resolved once and kept in the serializer
+    context, so list serializers share it across rows instead of calling
+    build_absolute_uri per object. URLs that are already absolute (Azure
+    blob storage in production) are returned unchanged.
+    """
+    if not url.startswith('/') or url.startswith('//'):
+        return url
+    base = serializer.context.get('_absolute_url_base')
+    if base is None:
+        request = serializer.context.get('request')
+        base = request.build_absolute_uri('/')[:-1] if request else ''
+        serializer.context['_absolute_url_base'] = base
+    return base + url
+
+
+class BulkManyRelatedField(serializers.ManyRelatedField):
+    """ManyRelatedField that resolves every submitted PK with a single IN query."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+
+        child = self.child_relation
+        queryset = child.get_queryset()
+        pk_field = queryset.model._meta.pk
+        pks = []
+        for item in data:
+            if child.pk_field is not None:
+                item = child.pk_field.to_internal_value(item)
+            try:
+                if isinstance(item, bool):
+                    raise TypeError
+                pks.append(pk_field.to_python(item))
+            except (TypeError, ValueError, DjangoValidationError):
+                child.fail('incorrect_type', data_type=type(item).__name__)
+
+        found = queryset.in_bulk(set(pks))
+        for pk in pks:
+            if pk not in found:
+                child.fail('does_not_exist', pk_value=pk)
+        return [found[pk] for pk in pks]
+
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """PrimaryKeyRelatedField whose many=True form uses BulkManyRelatedField."""
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BulkManyRelatedField(**list_kwargs)
+
+
 # ClinicLocation serializer (defined early for use in other serializers)
 class ClinicLocationSerializer(serializers.ModelSerializer):
     class Meta:
         model = ClinicLocation
-        fields = '__all__'
+        fields = ['id', 'name', 'address', 'phone', 'latitude', 'longitude']
+
+
+_CLINIC_COORDINATE = serializers.DecimalField(max_digits=9, decimal_places=6)
+
+
+def clinic_to_dict(clinic):
+    """Plain-dict equivalent of ClinicLocationSerializer(clinic).data."""
+    return {
+        'id': clinic.id,
+        'name': clinic.name,
+        'address': clinic.address,
+        'phone': clinic.phone,
+        'latitude': None if clinic.latitude is None else _CLINIC_COORDINATE.to_representation(clinic.latitude),
+        'longitude': None if clinic.longitude is None else _CLINIC_COORDINATE.to_representation(clinic.longitude),
+    }
+
+
+class ClinicDataField(serializers.Field):
+    """
+    Read-only nested clinic rendering for clinic_data / clinics_data.
+    Same output as a nested ClinicLocationSerializer, without building a
+    child serializer per parent. Rendered clinics are memoized by id in the
+    serializer context, so a list pays for each distinct clinic once.
+    """
+
+    def __init__(self, many=False, **kwargs):
+        self.many = many
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def _render(self, clinic):
+        cache = self.context.setdefault('_clinic_data', {})
+        data = cache.get(clinic.pk)
+        if data is None:
+            data = cache[clinic.pk] = clinic_to_dict(clinic)
+        return dict(data)
+
+    def to_representation(self, value):
+        if self.many:
+            return [self._render(clinic) for clinic in value.all()]
+        return self._render(value)
+
+
+def required_text_kwargs(message):
+    """extra_kwargs rejecting blank or null input with a field-specific message."""
+    return {
+        'allow_blank': False,
+        'allow_null': False,
+        'error_messages': {'blank': message, 'null': message},
+    }
+
 
 class UserSerializer(serializers.ModelSerializer):
     last_appointment_date = serializers.SerializerMethodField()
@@ -38,107 +189,61 @@ class UserSerializer(serializers.ModelSerializer):
                   'accepted_terms']
         extra_kwargs = {
             'password': {'write_only': True},
+            # Uniqueness is checked in validate_username; dropping the implicit
+            # UniqueValidator avoids a second lookup for the same value
+            'username': {'validators': [UnicodeUsernameValidator()]},
             'accepted_terms_at': {'read_only': True},
             'accepted_privacy_at': {'read_only': True},
             'policy_version': {'read_only': True},
+            # Non-blank checks run in the fields themselves (input is trimmed first)
+            'first_name': required_text_kwargs('First name is required'),
+            'last_name': required_text_kwargs('Last name is required'),
+            'email': required_text_kwargs('Email is required'),
+            'phone': required_text_kwargs('Contact number is required'),
+            'address_street': required_text_kwargs('Street address is required'),
+            'address_province': required_text_kwargs('Province is required'),
+            'address_city': required_text_kwargs('City/Municipality is required'),
+            'address_barangay': required_text_kwargs('Barangay is required'),
         }
 
     def get_last_appointment_date(self, obj):
         """
         Get the last appointment datetime for patients.
-        Optimized to use prefetched data to avoid N+1 queries.
+        List views prefetch ``last_appointment_cache`` (see
+        views.last_appointment_prefetch); when it is present it is
+        authoritative, so patients without a completed appointment no longer
+        fall through to a per-row query.
         """
-        if obj.user_type == 'patient':
-            # First, try to use prefetched data from the view
-            if hasattr(obj, 'last_appointment_cache') and obj.last_appointment_cache:
-                apt = obj.last_appointment_cache[0]
-                if hasattr(apt, 'completed_at') and apt.completed_at:
-                    return apt.completed_at
-                # Fallback: combine date and time
-                from datetime import datetime
-                return datetime.combine(apt.date, apt.time)
-            
-            # Second, check for annotated field
-            if hasattr(obj, 'last_completed_appointment') and obj.last_completed_appointment:
-                return obj.last_completed_appointment
-            
-            # Only as last resort, query the database
-            # This should rarely happen if views are properly using prefetch_related
-            try:
-                last_apt = obj.appointments.filter(status='completed').order_by(
-                    '-completed_at', '-date', '-time'
-                ).first()
-                if last_apt:
-                    if last_apt.completed_at:
-                        return last_apt.completed_at
-                    from datetime import datetime
-                    return datetime.combine(last_apt.date, last_apt.time)
-            except Exception:
-                pass
-        
-        return None
-    
-    def validate_first_name(self, value):
-        """Validate first name is not empty"""
-        if not value or not value.strip():
-            raise serializers.ValidationError("First name is required")
-        return value
-    
-    def validate_last_name(self, value):
-        """Validate last name is not empty"""
-        if not value or not value.strip():
-            raise serializers.ValidationError("Last name is required")
-        return value
-    
-    def validate_email(self, value):
-        """Validate email is not empty"""
-        if not value or not value.strip():
-            raise serializers.ValidationError("Email is required")
-        return value
+        if obj.user_type != 'patient':
+            return None
+
+        if hasattr(obj, 'last_appointment_cache'):
+            if not obj.last_appointment_cache:
+                return None
+            apt = obj.last_appointment_cache[0]
+            if apt.completed_at:
+                return apt.completed_at
+            return datetime.combine(apt.date, apt.time)
+
+        # Single-object paths (current_user, registration) are not prefetched
+        return obj.get_last_appointment_date()
     
     def validate_username(self, value):
         """Validate username is unique and not empty"""
         if not value or not value.strip():
             raise serializers.ValidationError("Username is required")
         
-        # Check if username already exists (only for new users, not updates)
-        if not self.instance:  # Creating new user
-            if User.objects.filter(username=value).exists():
-                raise serializers.ValidationError("This username is already taken")
-        else:  # Updating existing user
-            if User.objects.filter(username=value).exclude(id=self.instance.id).exists():
-                raise serializers.ValidationError("This username is already taken")
-        
-        return value
-    
-    def validate_phone(self, value):
-        """Validate phone number is not empty"""
-        if not value or not value.strip():
-            raise serializers.ValidationError("Contact number is required")
-        return value
-    
-    def validate_address_street(self, value):
-        """Validate street address is not empty"""
-        if not value or not value.strip():
-            raise serializers.ValidationError("Street address is required")
-        return value
-
-    def validate_address_province(self, value):
-        """Validate province is not empty"""
-        if not value or not value.strip():
-            raise serializers.ValidationError("Province is required")
-        return value
-
-    def validate_address_city(self, value):
-        """Validate city is not empty"""
-        if not value or not value.strip():
-            raise serializers.ValidationError("City/Municipality is required")
-        return value
+        # Unchanged username on update: nothing to check
+        if self.instance and self.instance.username == value:
+            return value
 
-    def validate_address_barangay(self, value):
-        """Validate barangay is not empty"""
-        if not value or not value.strip():
-            raise serializers.ValidationError("Barangay is required")
+        # username is unique, so this lookup is served by its index
+        existing = User.objects.filter(username=value)
+        if self.instance:  # Updating existing user
+            existing = existing.exclude(id=self.instance.id)
+        if existing.exists():
+            raise serializers.ValidationError("This username is already taken")
+        
         return value
     
     def validate_birthday(self, value):
@@ -151,7 +256,8 @@ class UserSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError("Birthdate is required")
             return value
             
-        today = timezone.now().date()
+        # Bulk imports can pass 'today' in the context to compute it once per batch
+        today = self.context.get('today') or timezone.now().date()
         age_in_days = (today - value).days
         
         # Check if birthday is in the future (applies to all users)
@@ -161,12 +267,12 @@ class UserSerializer(serializers.ModelSerializer):
         # Apply age restrictions based on user type
         
         if user_type == 'patient':
-            # Check if younger than 6 months (approximately 183 days)
-            if age_in_days < 183:
+            # Check if younger than 6 months
+            if age_in_days < PATIENT_MIN_AGE_DAYS:
                 raise serializers.ValidationError("Patient must be at least 6 months old to register")
             
-            # Check if 100 years old or older (exactly 36525 days or more)
-            if age_in_days >= 36525:
+            # Check if 100 years old or older
+            if age_in_days >= PATIENT_MAX_AGE_DAYS:
                 raise serializers.ValidationError("Patient must be younger than 100 years old")
         
         elif user_type == 'staff':
@@ -225,8 +331,8 @@ class UserSerializer(serializers.ModelSerializer):
 
 
 class ServiceSerializer(serializers.ModelSerializer):
-    clinics_data = ClinicLocationSerializer(source='clinics', many=True, read_only=True)
-    clinic_ids = serializers.PrimaryKeyRelatedField(
+    clinics_data = ClinicDataField(source='clinics', many=True)
+    clinic_ids = BulkPrimaryKeyRelatedField(
         source='clinics',
         many=True,
         queryset=ClinicLocation.objects.all(),
@@ -241,14 +347,15 @@ class ServiceSerializer(serializers.ModelSerializer):
 
 
 class AppointmentSerializer(serializers.ModelSerializer):
-    patient_name = serializers.CharField(source=PATIENT_FULL_NAME, read_only=True)
-    patient_email = serializers.CharField(source='patient.email', read_only=True)
+    # Read from the denormalized columns so list views need no patient join
+    patient_name = serializers.CharField(source='patient_full_name', read_only=True)
+    patient_email = serializers.CharField(read_only=True)
     dentist_name = serializers.CharField(source='dentist.get_full_name', read_only=True)
     service_name = serializers.CharField(source='service.name', read_only=True)
     service_color = serializers.CharField(source='service.color', read_only=True)
     reschedule_service_name = serializers.CharField(source='reschedule_service.name', read_only=True)
     reschedule_dentist_name = serializers.CharField(source='reschedule_dentist.get_full_name', read_only=True)
-    clinic_data = ClinicLocationSerializer(source='clinic', read_only=True)
+    clinic_data = ClinicDataField(source='clinic')
     clinic_name = serializers.CharField(source='clinic.name', read_only=True)
     invoice_id = serializers.SerializerMethodField(read_only=True)
     has_invoice = serializers.SerializerMethodField(read_only=True)
@@ -257,30 +364,45 @@ class AppointmentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Appointment
-        fields = '__all__'
+        fields = ['id', 'patient_name', 'patient_email', 'dentist_name', 'service_name',
+                  'service_color', 'reschedule_service_name', 'reschedule_dentist_name',
+                  'clinic_data', 'clinic_name', 'invoice_id', 'has_invoice',
+                  'created_by_name', 'created_by_type', 'date', 'time', 'status',
+                  'patient_status', 'notes', 'reschedule_date', 'reschedule_time',
+                  'reschedule_notes', 'cancel_reason', 'cancel_requested_at',
+                  'completed_at', 'created_at', 'updated_at',
+                  'patient', 'dentist', 'service', 'clinic', 'availability_slot',
+                  'reschedule_service', 'reschedule_dentist', 'created_by']
     
     def get_invoice_id(self, obj):
         """Return the invoice ID if an invoice exists for this appointment"""
-        return obj.invoice.id if hasattr(obj, 'invoice') else None
+        # Annotated by AppointmentQuerySet.with_related(); other callers fall
+        # back to the reverse one-to-one (one query)
+        if hasattr(obj, 'linked_invoice_id'):
+            return obj.linked_invoice_id
+        invoice = getattr(obj, 'invoice', None)
+        return invoice.id if invoice else None
     
     def get_has_invoice(self, obj):
         """Return True if an invoice exists for this appointment"""
-        return hasattr(obj, 'invoice')
+        return self.get_invoice_id(obj) is not None
 
 
 class DentalRecordSerializer(serializers.ModelSerializer):
     created_by_name = serializers.CharField(source=CREATED_BY_FULL_NAME, read_only=True)
-    clinic_data = ClinicLocationSerializer(source='clinic', read_only=True)
+    clinic_data = ClinicDataField(source='clinic')
     clinic_id = serializers.IntegerField(write_only=True, required=False, allow_null=True)
 
     class Meta:
         model = DentalRecord
-        fields = '__all__'
+        fields = ['id', 'created_by_name', 'clinic_data', 'clinic_id', 'treatment',
+                  'diagnosis', 'notes', 'created_at', 'patient', 'appointment', 'clinic',
+                  'created_by']
 
 
 class DocumentSerializer(serializers.ModelSerializer):
     uploaded_by_name = serializers.CharField(source='uploaded_by.get_full_name', read_only=True)
-    clinic_data = ClinicLocationSerializer(source='clinic', read_only=True)
+    clinic_data = ClinicDataField(source='clinic')
     appointment_date = serializers.DateField(source='appointment.date', read_only=True)
     appointment_time = serializers.TimeField(source='appointment.time', read_only=True)
     service_name = serializers.CharField(source='appointment.service.name', read_only=True)
@@ -298,32 +420,33 @@ class DocumentSerializer(serializers.ModelSerializer):
 
     def get_file_url(self, obj):
         if obj.file:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.file.url)
-            return obj.file.url
+            return absolute_media_url(self, obj.file.url)
         return None
 
 
 class InventoryItemSerializer(serializers.ModelSerializer):
     is_low_stock = serializers.BooleanField(read_only=True)
     clinic_name = serializers.CharField(source='clinic.name', read_only=True)
-    clinic_data = ClinicLocationSerializer(source='clinic', read_only=True)
+    clinic_data = ClinicDataField(source='clinic')
 
     class Meta:
         model = InventoryItem
-        fields = '__all__'
+        fields = ['id', 'is_low_stock', 'clinic_name', 'clinic_data', 'name', 'category',
+                  'quantity', 'min_stock', 'supplier', 'unit_cost', 'cost', 'updated_at',
+                  'clinic']
 
 
 class BillingSerializer(serializers.ModelSerializer):
     patient_name = serializers.CharField(source=PATIENT_FULL_NAME, read_only=True)
     created_by_name = serializers.CharField(source=CREATED_BY_FULL_NAME, read_only=True)
-    clinic_data = ClinicLocationSerializer(source='clinic', read_only=True)
+    clinic_data = ClinicDataField(source='clinic')
     clinic_id = serializers.IntegerField(write_only=True, required=False, allow_null=True)
 
     class Meta:
         model = Billing
-        fields = '__all__'
+        fields = ['id', 'patient_name', 'created_by_name', 'clinic_data', 'clinic_id',
+                  'amount', 'description', 'soa_file', 'status', 'paid', 'created_at',
+                  'updated_at', 'patient', 'appointment', 'clinic', 'created_by']
 
 
 class TreatmentPlanSerializer(serializers.ModelSerializer):
@@ -331,7 +454,8 @@ class TreatmentPlanSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = TreatmentPlan
-        fields = '__all__'
+        fields = ['id', 'created_by_name', 'title', 'description', 'start_date',
+                  'end_date', 'status', 'created_at', 'patient', 'created_by']
 
 
 class TeethImageSerializer(serializers.ModelSerializer):
@@ -358,25 +482,15 @@ class TeethImageSerializer(serializers.ModelSerializer):
 
     def get_image_url(self, obj):
         if obj.image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.image.url)
-            return obj.image.url
+            return absolute_media_url(self, obj.image.url)
         return None
 
-    def to_representation(self, instance):
-        """Return appointment as integer ID in responses"""
-        data = super().to_representation(instance)
-        if instance.appointment:
-            data['appointment'] = instance.appointment.id
-        return data
-
 
 class StaffAvailabilitySerializer(serializers.ModelSerializer):
     staff_name = serializers.CharField(source='staff.get_full_name', read_only=True)
     day_name = serializers.CharField(source='get_day_of_week_display', read_only=True)
-    clinics_data = ClinicLocationSerializer(source='clinics', many=True, read_only=True)
-    clinic_ids = serializers.PrimaryKeyRelatedField(
+    clinics_data = ClinicDataField(source='clinics', many=True)
+    clinic_ids = BulkPrimaryKeyRelatedField(
         source='clinics',
         many=True,
         queryset=ClinicLocation.objects.all(),
@@ -392,9 +506,24 @@ class StaffAvailabilitySerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
 
-class DentistAvailabilitySerializer(serializers.ModelSerializer):
+class TimeRangeValidationMixin:
+    """
+    Friendly 400 for end_time <= start_time. The database enforces the same
+    rule through a CHECK constraint on the model.
+    """
+
+    def validate(self, data):
+        """Ensure end_time is after start_time"""
+        data = super().validate(data)
+        if 'start_time' in data and 'end_time' in data:
+            if data['end_time'] <= data['start_time']:
+                raise serializers.ValidationError("End time must be after start time")
+        return data
+
+
+class DentistAvailabilitySerializer(TimeRangeValidationMixin, serializers.ModelSerializer):
     dentist_name = serializers.CharField(source='dentist.get_full_name', read_only=True)
-    clinic_data = ClinicLocationSerializer(source='clinic', read_only=True)
+    clinic_data = ClinicDataField(source='clinic')
     clinic_id = serializers.PrimaryKeyRelatedField(
         source='clinic',
         queryset=ClinicLocation.objects.all(),
@@ -413,56 +542,37 @@ class DentistAvailabilitySerializer(serializers.ModelSerializer):
         # We handle uniqueness manually in the create method
         validators = []
 
-    def validate(self, data):
-        """Ensure end_time is after start_time"""
-        if 'start_time' in data and 'end_time' in data:
-            if data['end_time'] <= data['start_time']:
-                raise serializers.ValidationError("End time must be after start time")
-        return data
-
     def create(self, validated_data):
         """Update existing availability or create new one to avoid unique constraint errors"""
+        model = self.Meta.model
         dentist = validated_data.get('dentist')
         date = validated_data.get('date')
         clinic = validated_data.get('clinic')
         apply_to_all = validated_data.get('apply_to_all_clinics', False)
-        
+
         # Try to find existing availability for this dentist + date + clinic combo
-        try:
-            existing = self.Meta.model.objects.get(
-                dentist=dentist,
-                date=date,
-                clinic=clinic
-            )
-            # Update existing record
-            for key, value in validated_data.items():
-                setattr(existing, key, value)
-            existing.save()
-            return existing
-        except self.Meta.model.DoesNotExist:
-            # If we're setting a specific clinic, check if there's an old record with clinic=null
-            # that we should update instead of creating a duplicate
-            if clinic is not None and not apply_to_all:
-                old_null_clinic = self.Meta.model.objects.filter(
-                    dentist=dentist,
-                    date=date,
-                    clinic__isnull=True
-                ).first()
-                
-                if old_null_clinic:
-                    # Update the old record to use the new clinic
-                    for key, value in validated_data.items():
-                        setattr(old_null_clinic, key, value)
-                    old_null_clinic.save()
-                    return old_null_clinic
-            
-            # Create new record
+        existing = model.objects.filter(dentist=dentist, date=date, clinic=clinic).first()
+
+        # If we're setting a specific clinic, reuse an old record with clinic=null
+        # instead of creating a duplicate
+        if existing is None and clinic is not None and not apply_to_all:
+            existing = model.objects.filter(
+                dentist=dentist, date=date, clinic__isnull=True
+            ).first()
+
+        if existing is None:
             return super().create(validated_data)
 
+        # Only write the submitted columns (save() keeps post_save cache invalidation)
+        for key, value in validated_data.items():
+            setattr(existing, key, value)
+        existing.save(update_fields=[*validated_data, 'updated_at'])
+        return existing
 
-class BlockedTimeSlotSerializer(serializers.ModelSerializer):
+
+class BlockedTimeSlotSerializer(TimeRangeValidationMixin, serializers.ModelSerializer):
     created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True)
-    clinic_data = ClinicLocationSerializer(source='clinic', read_only=True)
+    clinic_data = ClinicDataField(source='clinic')
     clinic_id = serializers.PrimaryKeyRelatedField(
         source='clinic',
         queryset=ClinicLocation.objects.all(),
@@ -478,13 +588,6 @@ class BlockedTimeSlotSerializer(serializers.ModelSerializer):
                   'created_by', 'created_by_name', 'created_at', 'updated_at']
         read_only_fields = ['created_by', 'created_at', 'updated_at']
 
-    def validate(self, data):
-        """Ensure end_time is after start_time"""
-        if 'start_time' in data and 'end_time' in data:
-            if data['end_time'] <= data['start_time']:
-                raise serializers.ValidationError("End time must be after start time")
-        return data
-
 
 class DentistNotificationSerializer(serializers.ModelSerializer):
     dentist_name = serializers.CharField(source='dentist.get_full_name', read_only=True)
@@ -496,15 +599,17 @@ class DentistNotificationSerializer(serializers.ModelSerializer):
                   'notification_type', 'message', 'is_read', 'created_at']
         read_only_fields = ['created_at']
 
+    # Expects the viewset to select_related('appointment__service');
+    # the patient name comes from the denormalized patient_full_name column.
     def get_appointment_details(self, obj):
-        if obj.appointment:
+        if obj.appointment_id:
             try:
                 return {
                     'id': obj.appointment.id,
-                    'patient_name': obj.appointment.patient.get_full_name() if obj.appointment.patient else 'Unknown Patient',
+                    'patient_name': obj.appointment.patient_full_name or 'Unknown Patient',
                     'date': obj.appointment.date,
                     'time': obj.appointment.time,
-                    'service': obj.appointment.service.name if obj.appointment.service else None,
+                    'service': obj.appointment.service.name if obj.appointment.service_id else None,
                 }
             except Exception:
                 return {'id': obj.appointment.id, 'error': 'Could not load appointment details'}
@@ -521,24 +626,26 @@ class AppointmentNotificationSerializer(serializers.ModelSerializer):
                   'notification_type', 'message', 'is_read', 'created_at']
         read_only_fields = ['created_at']
 
+    # Expects the viewset to select_related the appointment's service and
+    # reschedule_* relations so list rendering stays a single query.
     def get_appointment_details(self, obj):
-        if obj.appointment:
+        if obj.appointment_id:
             try:
                 appointment_data = {
                     'id': obj.appointment.id,
-                    'patient_name': obj.appointment.patient.get_full_name() if obj.appointment.patient else 'Unknown Patient',
+                    'patient_name': obj.appointment.patient_full_name or 'Unknown Patient',
                     'date': str(obj.appointment.date),
                     'time': str(obj.appointment.time),
                     'status': obj.appointment.status,
-                    'service_name': obj.appointment.service.name if obj.appointment.service else None,
+                    'service_name': obj.appointment.service.name if obj.appointment.service_id else None,
                 }
                 
                 # Add reschedule details if this is a reschedule request
                 if obj.notification_type == 'reschedule_request' and obj.appointment.reschedule_date:
                     appointment_data['requested_date'] = str(obj.appointment.reschedule_date)
                     appointment_data['requested_time'] = str(obj.appointment.reschedule_time)
-                    appointment_data['reschedule_service'] = obj.appointment.reschedule_service.name if obj.appointment.reschedule_service else None
-                    appointment_data['reschedule_dentist'] = obj.appointment.reschedule_dentist.get_full_name() if obj.appointment.reschedule_dentist else None
+                    appointment_data['reschedule_service'] = obj.appointment.reschedule_service.name if obj.appointment.reschedule_service_id else None
+                    appointment_data['reschedule_dentist'] = obj.appointment.reschedule_dentist.get_full_name() if obj.appointment.reschedule_dentist_id else None
                 
                 # Add cancel reason if this is a cancel request
                 if obj.notification_type == 'cancel_request' and obj.appointment.cancel_reason:
@@ -564,7 +671,12 @@ class PatientIntakeFormSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = PatientIntakeForm
-        fields = '__all__'
+        fields = ['id', 'patient_name', 'filled_by_name', 'allergies',
+                  'current_medications', 'medical_conditions',
+                  'previous_dental_treatments', 'emergency_contact_name',
+                  'emergency_contact_phone', 'emergency_contact_relationship',
+                  'insurance_provider', 'insurance_policy_number', 'dental_concerns',
+                  'preferred_dentist', 'created_at', 'updated_at', 'patient', 'filled_by']
         read_only_fields = ['created_at', 'updated_at']
 
 
@@ -572,40 +684,32 @@ class FileAttachmentSerializer(serializers.ModelSerializer):
     patient_name = serializers.CharField(source=PATIENT_FULL_NAME, read_only=True)
     uploaded_by_name = serializers.CharField(source='uploaded_by.get_full_name', read_only=True)
     file_url = serializers.SerializerMethodField()
-    file_extension = serializers.SerializerMethodField()
+    file_extension = serializers.CharField(source='get_file_extension', read_only=True)
 
     class Meta:
         model = FileAttachment
-        fields = '__all__'
+        fields = ['id', 'patient_name', 'uploaded_by_name', 'file_url', 'file_extension',
+                  'file', 'file_type', 'title', 'description', 'file_size', 'uploaded_at',
+                  'patient', 'uploaded_by']
         read_only_fields = ['uploaded_at', 'file_size']
 
     def get_file_url(self, obj):
         if obj.file:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.file.url)
-            return obj.file.url
+            return absolute_media_url(self, obj.file.url)
         return None
-    
-    def get_file_extension(self, obj):
-        return obj.get_file_extension()
 
 
 class ClinicalNoteSerializer(serializers.ModelSerializer):
     patient_name = serializers.CharField(source=PATIENT_FULL_NAME, read_only=True)
     author_name = serializers.CharField(source='author.get_full_name', read_only=True)
-    appointment_date = serializers.SerializerMethodField()
+    appointment_date = serializers.DateField(source='appointment.date', read_only=True, allow_null=True)
 
     class Meta:
         model = ClinicalNote
-        fields = '__all__'
+        fields = ['id', 'patient_name', 'author_name', 'appointment_date', 'content',
+                  'created_at', 'updated_at', 'patient', 'appointment', 'author']
         read_only_fields = ['created_at', 'updated_at']
 
-    def get_appointment_date(self, obj):
-        if obj.appointment:
-            return str(obj.appointment.date)
-        return None
-
 
 class TreatmentAssignmentSerializer(serializers.ModelSerializer):
     patient_name = serializers.CharField(source=PATIENT_FULL_NAME, read_only=True)
@@ -615,7 +719,10 @@ class TreatmentAssignmentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = TreatmentAssignment
-        fields = '__all__'
+        fields = ['id', 'patient_name', 'assigned_by_name', 'assigned_dentist_name',
+                  'treatment_plan_title', 'treatment_name', 'description', 'status',
+                  'date_assigned', 'scheduled_date', 'completed_date', 'notes', 'patient',
+                  'treatment_plan', 'assigned_by', 'assigned_dentist']
         read_only_fields = ['date_assigned']
 
 
@@ -623,6 +730,28 @@ class TreatmentAssignmentSerializer(serializers.ModelSerializer):
 # INVOICE SERIALIZERS
 # ============================================================================
 
+def excluded_fields(request):
+    """Field names a list caller opted out of with ?exclude=name,..."""
+    query_params = getattr(request, 'query_params', None)
+    if not query_params:
+        return set()
+    return {name.strip() for name in query_params.get('exclude', '').split(',') if name.strip()}
+
+
+class OmittableFieldsMixin:
+    """
+    Let callers drop heavy nested fields listed in ``omittable_fields`` with
+    ?exclude=..., e.g. pickers that only need invoice totals. Responses are
+    unchanged unless the parameter is sent.
+    """
+    omittable_fields = ()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for name in excluded_fields(self.context.get('request')).intersection(self.omittable_fields):
+            self.fields.pop(name, None)
+
+
 class InvoiceItemSerializer(serializers.ModelSerializer):
     """Serializer for invoice line items"""
     inventory_item_name = serializers.CharField(source='inventory_item.name', read_only=True)
@@ -637,8 +766,10 @@ class InvoiceItemSerializer(serializers.ModelSerializer):
         read_only_fields = ['total_price', 'created_at', 'updated_at']
 
 
-class InvoiceSerializer(serializers.ModelSerializer):
+class InvoiceSerializer(OmittableFieldsMixin, serializers.ModelSerializer):
     """Serializer for invoices with nested items"""
+    omittable_fields = ('items',)
+
     # Related object details
     patient_name = serializers.CharField(source='patient.get_full_name', read_only=True)
     patient_email = serializers.CharField(source='patient.email', read_only=True)
@@ -651,7 +782,7 @@ class InvoiceSerializer(serializers.ModelSerializer):
     service_name = serializers.CharField(source='appointment.service.name', read_only=True)
     dentist_name = serializers.CharField(source='appointment.dentist.get_full_name', read_only=True)
     
-    # Nested invoice items
+    # Nested invoice items (omit with ?exclude=items)
     items = InvoiceItemSerializer(many=True, read_only=True)
     
     # PDF file URL
@@ -678,13 +809,19 @@ class InvoiceSerializer(serializers.ModelSerializer):
     def get_pdf_url(self, obj):
         """Get the full URL for the PDF file"""
         if obj.pdf_file:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.pdf_file.url)
-            return obj.pdf_file.url
+            return absolute_media_url(self, obj.pdf_file.url)
         return None
 
 
+def rows_by_submitted_id(queryset, rows, key):
+    """
+    Load every object referenced by ``row[key]`` with one IN query.
+    Keyed by str(pk) so ids submitted as numeric strings still match.
+    """
+    ids = {row[key] for row in rows if isinstance(row, dict) and key in row}
+    return {str(pk): obj for pk, obj in queryset.in_bulk(ids).items()}
+
+
 class InvoiceCreateSerializer(serializers.Serializer):
     """Serializer for creating invoices with items"""
     appointment_id = serializers.IntegerField()
@@ -700,15 +837,15 @@ class InvoiceCreateSerializer(serializers.Serializer):
     
     def validate_appointment_id(self, value):
         """Validate appointment exists and is completed"""
-        try:
-            appointment = Appointment.objects.get(id=value)
-        except Appointment.DoesNotExist:
+        # Status and any linked invoice in one query (LEFT JOIN on the reverse one-to-one)
+        appointment = Appointment.objects.filter(id=value).values('status', 'invoice__id').first()
+        if appointment is None:
             raise serializers.ValidationError("Appointment not found")
         
-        if appointment.status != 'completed':
+        if appointment['status'] != 'completed':
             raise serializers.ValidationError("Can only create invoice for completed appointments")
         
-        if hasattr(appointment, 'invoice'):
+        if appointment['invoice__id'] is not None:
             raise serializers.ValidationError("Invoice already exists for this appointment")
         
         return value
@@ -726,6 +863,7 @@ class InvoiceCreateSerializer(serializers.Serializer):
         if not value:
             return []
         
+        inventory_items = rows_by_submitted_id(InventoryItem.objects.all(), value, 'inventory_item_id')
         validated_items = []
         for item in value:
             # Validate required fields
@@ -737,9 +875,8 @@ class InvoiceCreateSerializer(serializers.Serializer):
                 raise serializers.ValidationError("Each item must have a unit_price")
             
             # Validate inventory item exists
-            try:
-                inventory_item = InventoryItem.objects.get(id=item['inventory_item_id'])
-            except InventoryItem.DoesNotExist:
+            inventory_item = inventory_items.get(str(item['inventory_item_id']))
+            if inventory_item is None:
                 raise serializers.ValidationError(f"Inventory item {item['inventory_item_id']} not found")
             
             # Validate quantity
@@ -799,15 +936,17 @@ class PaymentSplitSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at', 'voided_at']
 
 
-class PaymentSerializer(serializers.ModelSerializer):
+class PaymentSerializer(OmittableFieldsMixin, serializers.ModelSerializer):
     """Serializer for payments with nested splits"""
+    omittable_fields = ('splits',)
+
     patient_name = serializers.CharField(source='patient.get_full_name', read_only=True)
     patient_email = serializers.CharField(source='patient.email', read_only=True)
     clinic_name = serializers.CharField(source='clinic.name', read_only=True)
     recorded_by_name = serializers.CharField(source='recorded_by.get_full_name', read_only=True)
     voided_by_name = serializers.CharField(source='voided_by.get_full_name', read_only=True)
     
-    # Nested splits
+    # Nested splits (omit with ?exclude=splits)
     splits = PaymentSplitSerializer(many=True, read_only=True)
     
     # Calculated fields
@@ -871,6 +1010,8 @@ class PaymentRecordSerializer(serializers.Serializer):
         if not value:
             raise serializers.ValidationError("At least one invoice allocation is required")
         
+        # Kept for validate(), which checks the invoices' patient
+        self._allocation_invoices = rows_by_submitted_id(Invoice.objects.all(), value, 'invoice_id')
         validated_allocations = []
         total_allocated = Decimal('0')
         
@@ -882,9 +1023,8 @@ class PaymentRecordSerializer(serializers.Serializer):
                 raise serializers.ValidationError("Each allocation must have 'amount'")
             
             # Validate invoice exists
-            try:
-                invoice = Invoice.objects.select_related('patient').get(id=alloc['invoice_id'])
-            except Invoice.DoesNotExist:
+            invoice = self._allocation_invoices.get(str(alloc['invoice_id']))
+            if invoice is None:
                 raise serializers.ValidationError(f"Invoice {alloc['invoice_id']} not found")
             
             # Validate amount - convert to Decimal
@@ -922,10 +1062,8 @@ class PaymentRecordSerializer(serializers.Serializer):
                 f"Total allocations (PHP {total_allocated}) exceed payment amount (PHP {data['amount']})"
             )
         
-        # Validate all invoices belong to the same patient
-        invoice_ids = [alloc['invoice_id'] for alloc in data['allocations']]
-        invoices = Invoice.objects.filter(id__in=invoice_ids).values_list('patient_id', flat=True)
-        unique_patients = set(invoices)
+        # Validate all invoices belong to the same patient (loaded by validate_allocations)
+        unique_patients = {invoice.patient_id for invoice in self._allocation_invoices.values()}
         
         if len(unique_patients) > 1:
             raise serializers.ValidationError("All invoices must belong to the same patient")
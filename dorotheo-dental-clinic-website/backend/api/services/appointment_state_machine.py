@@ -89,6 +89,10 @@ VALID_TRANSITIONS = {
     ],
 }
 
+# Set views of the map for membership checks on every status change
+_TRANSITION_SETS = {state: frozenset(targets) for state, targets in VALID_TRANSITIONS.items()}
+_TERMINAL_STATES = frozenset(state for state, targets in _TRANSITION_SETS.items() if not targets)
+
 
 # ══════════════════════════════════════════════════════════════════════════
 # STATE VALIDATION
@@ -112,8 +116,7 @@ def is_valid_transition(from_state: str, to_state: str) -> bool:
         logger.error("Invalid to_state: %s", to_state)
         return False
 
-    allowed = VALID_TRANSITIONS.get(from_state, [])
-    return to_state in allowed
+    return to_state in _TRANSITION_SETS.get(from_state, ())
 
 
 def get_allowed_transitions(state: str) -> List[str]:
@@ -125,7 +128,7 @@ def get_allowed_transitions(state: str) -> List[str]:
 
 def is_terminal_state(state: str) -> bool:
     """Check if a state is terminal (no further transitions allowed)."""
-    return state in VALID_STATES and len(VALID_TRANSITIONS.get(state, [])) == 0
+    return state in _TERMINAL_STATES
 
 
 # ══════════════════════════════════════════════════════════════════════════
@@ -128,7 +128,7 @@ def get_blocked_ranges(date: date_obj, clinic: Optional[ClinicLocation] = None)
     qs = BlockedTimeSlot.objects.filter(date=date)
     if clinic:
         qs = qs.filter(Q(clinic=clinic) | Q(apply_to_all_clinics=True))
-    return [(b.start_time, b.end_time) for b in qs]
+    return list(qs.values_list('start_time', 'end_time'))
 
 
 def is_blocked(slot_time: time_obj, blocked: List[tuple]) -> bool:
@@ -212,6 +212,23 @@ def user_post_delete(sender, instance, **kwargs):
         logger.error(f"Error in user_post_delete: {e}")
 
 
+@receiver(post_save, sender=User)
+def sync_appointment_patient_snapshot(sender, instance, created, update_fields=None, **kwargs):
+    """Propagate name/email changes to the denormalized columns on Appointment."""
+    if created:
+        return
+    # Partial saves that skip name/email (e.g. last_login on every login) can't change the snapshot
+    if update_fields is not None and not {'first_name', 'last_name', 'email'} & set(update_fields):
+        return
+    try:
+        full_name = instance.get_full_name()
+        instance.appointments.exclude(
+            patient_full_name=full_name, patient_email=instance.email
+        ).update(patient_full_name=full_name, patient_email=instance.email)
+    except Exception as e:
+        logger.error(f"Error in sync_appointment_patient_snapshot: {e}")
+
+
 # ==================== DENTAL RECORD SIGNALS ====================
 
 @receiver(pre_save, sender='api.DentalRecord')
@@ -999,6 +1016,15 @@ def clinic_location_changed_on_delete(sender, instance, **kwargs):
 
 # ==================== RAG PAGE CHUNK CACHE INVALIDATION ====================
 
+def _clear_rag_context_cache():
+    """Invalidate cached get_context() results after knowledge-base changes."""
+    try:
+        from api.rag.page_index_service import clear_context_cache
+        clear_context_cache()
+    except Exception as e:
+        logger.error("Error clearing RAG context cache: %s", e)
+
+
 @receiver(post_save, sender='api.PageChunk')
 def page_chunk_changed_on_save(sender, instance, **kwargs):
     """
@@ -1006,6 +1032,7 @@ def page_chunk_changed_on_save(sender, instance, **kwargs):
     so the chatbot picks up new knowledge-base content immediately.
     """
     _clear_chatbot_cache(f"PageChunk saved (id={instance.id})")
+    _clear_rag_context_cache()
 
 
 @receiver(post_delete, sender='api.PageChunk')
@@ -1014,6 +1041,7 @@ def page_chunk_changed_on_delete(sender, instance, **kwargs):
     Clear chatbot cache when a PageChunk is deleted.
     """
     _clear_chatbot_cache(f"PageChunk deleted (id={instance.id})")
+    _clear_rag_context_cache()
 
 
 # ==================== DENTIST / STAFF USER CACHE INVALIDATION ====================
@@ -0,0 +1,24 @@
+"""
+Test runner that keeps files uploaded by the test suite out of media/.
+"""
+
+import shutil
+import tempfile
+
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TempMediaRootRunner(DiscoverRunner):
+    """Point MEDIA_ROOT at a throwaway directory for the whole test run."""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._media_root = tempfile.mkdtemp(prefix='dental_clinic_test_media_')
+        self._media_override = override_settings(MEDIA_ROOT=self._media_root)
+        self._media_override.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._media_override.disable()
+        shutil.rmtree(self._media_root, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,79 @@
+"""
+Shared fixtures for the list-endpoint query-count tests.
+
+Subclasses implement add_row(n) to create the n-th row set their endpoints
+list; assert_queries_constant() then checks the cost of a list request does
+not grow with the number of rows.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from api.models import ClinicLocation, Service
+
+User = get_user_model()
+
+
+class ListQueryCountTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.clinic = ClinicLocation.objects.create(
+            name='Clinic A', address='Address A', phone='111-1111'
+        )
+        cls.service = Service.objects.create(
+            name='Cleaning', category='preventive',
+            description='Dental cleaning', duration=30,
+        )
+        cls.owner = User.objects.create_user(
+            username='list_owner', password='testpass123',
+            email='list_owner@example.com', user_type='owner',
+            first_name='Olive', last_name='Owner',
+        )
+        cls.dentist = User.objects.create_user(
+            username='list_dentist', password='testpass123',
+            email='list_dentist@example.com', user_type='staff',
+            role='dentist', first_name='Dana', last_name='Dentist',
+        )
+        cls.patient = User.objects.create_user(
+            username='list_patient', password='testpass123',
+            email='list_patient@example.com', user_type='patient',
+            first_name='Pat', last_name='Patient',
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+        self._created = 0
+
+    def add_row(self, n):
+        raise NotImplementedError
+
+    def _add_rows(self, count):
+        for _ in range(count):
+            self._created += 1
+            self.add_row(self._created)
+
+    def _get(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return ctx, response
+
+    def _rows(self, response):
+        data = response.json()
+        return data['results'] if isinstance(data, dict) else data
+
+    def assert_queries_constant(self, url):
+        """Compare a list of 2 rows with a list of 8; returns the larger request."""
+        self._add_rows(2)
+        self._get(url)  # warm-up: first call may create per-user rows
+        small, _ = self._get(url)
+        self._add_rows(6)
+        large, response = self._get(url)
+        self.assertEqual(len(small), len(large))
+        return large, response
@@ -0,0 +1,87 @@
+"""
+Tests for the denormalized patient name/email snapshot on Appointment.
+"""
+
+from datetime import date, time
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models.signals import post_save, pre_save
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from api.models import Appointment, ClinicLocation, Service
+from api.signals import appointment_post_save, appointment_pre_save
+
+User = get_user_model()
+
+
+class AppointmentPatientSnapshotTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.clinic = ClinicLocation.objects.create(
+            name='Clinic A', address='Address A', phone='111-1111'
+        )
+        cls.service = Service.objects.create(
+            name='Cleaning', category='preventive',
+            description='Dental cleaning', duration=30,
+        )
+        cls.patient = User.objects.create_user(
+            username='snapshot_patient', password='testpass123',
+            email='snapshot_patient@example.com', user_type='patient',
+            first_name='Pat', last_name='Patient',
+        )
+        cls.other_patient = User.objects.create_user(
+            username='snapshot_other', password='testpass123',
+            email='snapshot_other@example.com', user_type='patient',
+            first_name='Olga', last_name='Other',
+        )
+
+    def setUp(self):
+        self.appointment = Appointment.objects.create(
+            patient=self.patient, service=self.service, clinic=self.clinic,
+            date=date(2030, 1, 1), time=time(10, 0), status='pending',
+        )
+
+    def _user_queries(self, ctx):
+        return [q['sql'] for q in ctx.captured_queries if 'FROM "api_user"' in q['sql']]
+
+    def test_snapshot_set_on_create(self):
+        self.assertEqual(self.appointment.patient_full_name, 'Pat Patient')
+        self.assertEqual(self.appointment.patient_email, 'snapshot_patient@example.com')
+
+    def test_status_only_save_skips_patient_lookup(self):
+        # The audit receivers read the patient themselves; measure save() alone
+        for signal, receiver in [(pre_save, appointment_pre_save), (post_save, appointment_post_save)]:
+            signal.disconnect(receiver, sender=Appointment)
+            self.addCleanup(signal.connect, receiver, sender=Appointment)
+
+        appointment = Appointment.objects.get(pk=self.appointment.pk)
+        appointment.status = 'confirmed'
+        with CaptureQueriesContext(connection) as ctx:
+            appointment.save(update_fields=['status'])
+        self.assertEqual(self._user_queries(ctx), [])
+
+    def test_partial_save_of_patient_writes_snapshot(self):
+        appointment = Appointment.objects.get(pk=self.appointment.pk)
+        appointment.patient = self.other_patient
+        appointment.save(update_fields=['patient'])
+        appointment.refresh_from_db()
+        self.assertEqual(appointment.patient_full_name, 'Olga Other')
+        self.assertEqual(appointment.patient_email, 'snapshot_other@example.com')
+
+    def test_user_save_without_name_fields_skips_sync(self):
+        patient = User.objects.get(pk=self.patient.pk)
+        patient.last_login = timezone.now()
+        with CaptureQueriesContext(connection) as ctx:
+            patient.save(update_fields=['last_login'])
+        self.assertFalse([q for q in ctx.captured_queries if 'api_appointment' in q['sql']])
+
+    def test_name_change_propagates(self):
+        patient = User.objects.get(pk=self.patient.pk)
+        patient.first_name = 'Patricia'
+        patient.save(update_fields=['first_name'])
+        self.appointment.refresh_from_db()
+        self.assertEqual(self.appointment.patient_full_name, 'Patricia Patient')
@@ -0,0 +1,102 @@
+"""
+Query-count tests for the invoice and payment list endpoints.
+
+InvoiceSerializer and PaymentSerializer read several relations per row
+(patient, clinic, appointment service/dentist, nested items and splits)
+plus the payment's allocated amount; list cost must not grow with rows.
+"""
+
+from datetime import date, time
+from decimal import Decimal
+
+from rest_framework import status
+
+from api.models import (
+    Appointment, InventoryItem, Invoice, InvoiceItem, Payment, PaymentSplit,
+)
+from api.tests.query_counts import ListQueryCountTestCase
+
+
+class BillingListQueryCountTest(ListQueryCountTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.inventory_item = InventoryItem.objects.create(
+            name='Floss', category='supplies', quantity=100, clinic=cls.clinic,
+        )
+
+    def add_row(self, n):
+        appointment = Appointment.objects.create(
+            patient=self.patient, dentist=self.dentist, service=self.service,
+            clinic=self.clinic, date=date(2030, 1, n), time=time(10, 0),
+            status='completed',
+        )
+        invoice = Invoice.objects.create(
+            invoice_number=f'INV-2030-01-{n:04d}', reference_number=f'REF-{n:04d}',
+            appointment=appointment, patient=self.patient, clinic=self.clinic,
+            created_by=self.owner, service_charge=Decimal('500.00'),
+            invoice_date=date(2030, 1, n), due_date=date(2030, 2, n),
+        )
+        InvoiceItem.objects.create(
+            invoice=invoice, inventory_item=self.inventory_item, item_name='Floss',
+            quantity=1, unit_price=Decimal('50.00'), total_price=Decimal('50.00'),
+        )
+        payment = Payment.objects.create(
+            payment_number=f'PAY-2030-01-{n:04d}', patient=self.patient,
+            clinic=self.clinic, amount=Decimal('300.00'),
+            payment_date=date(2030, 1, n), recorded_by=self.owner,
+        )
+        PaymentSplit.objects.create(
+            payment=payment, invoice=invoice, amount=Decimal('200.00'),
+            provider=self.dentist,
+        )
+        PaymentSplit.objects.create(
+            payment=payment, invoice=invoice, amount=Decimal('50.00'),
+            provider=self.dentist, is_voided=True,
+        )
+
+    def test_invoice_list_queries_do_not_grow(self):
+        self.assert_queries_constant('/api/invoices/')
+
+    def test_patient_balance_queries_do_not_grow(self):
+        self.assert_queries_constant(f'/api/invoices/patient_balance/{self.patient.id}/')
+
+    def test_payment_list_queries_do_not_grow(self):
+        _, response = self.assert_queries_constant('/api/payments/')
+        rows = self._rows(response)
+        # Voided splits are excluded from the allocated amount
+        self.assertEqual(rows[0]['allocated_amount'], 200.0)
+        self.assertEqual(rows[0]['unallocated_amount'], 100.0)
+        self.assertEqual(rows[0]['splits'][0]['provider_name'], self.dentist.get_full_name())
+
+    def test_exclude_drops_nested_lists(self):
+        self._add_rows(2)
+        full, response = self._get('/api/invoices/')
+        self.assertIn('items', self._rows(response)[0])
+
+        trimmed, response = self._get('/api/invoices/?exclude=items')
+        row = self._rows(response)[0]
+        self.assertNotIn('items', row)
+        self.assertIn('invoice_number', row)
+        # The items prefetch is skipped as well
+        self.assertEqual(len(trimmed), len(full) - 1)
+
+        _, response = self._get('/api/payments/?exclude=splits')
+        row = self._rows(response)[0]
+        self.assertNotIn('splits', row)
+        self.assertEqual(row['allocated_amount'], 200.0)
+
+    def test_void_stamps_payment_and_splits_together(self):
+        self._add_rows(1)
+        payment = Payment.objects.get()
+        created = {split.pk: split.updated_at for split in payment.splits.all()}
+
+        response = self.client.post(f'/api/payments/{payment.pk}/void/', {'reason': 'Duplicate'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        payment.refresh_from_db()
+        for split in payment.splits.all():
+            self.assertTrue(split.is_voided)
+            self.assertEqual(split.voided_at, payment.voided_at)
+            self.assertGreater(split.updated_at, created[split.pk])
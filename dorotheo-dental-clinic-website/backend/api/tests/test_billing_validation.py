@@ -0,0 +1,132 @@
+"""
+Tests for invoice item and payment allocation validation.
+"""
+
+from datetime import date, time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import ValidationError
+
+from api.models import Appointment, ClinicLocation, InventoryItem, Invoice, Service
+from api.serializers import InvoiceCreateSerializer, PaymentRecordSerializer
+
+User = get_user_model()
+
+
+class BillingValidationTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.clinic = ClinicLocation.objects.create(
+            name='Clinic A', address='Address A', phone='111-1111'
+        )
+        cls.service = Service.objects.create(
+            name='Cleaning', category='preventive',
+            description='Dental cleaning', duration=30,
+        )
+        cls.patient = User.objects.create_user(
+            username='validation_patient', password='testpass123',
+            email='validation_patient@example.com', user_type='patient',
+        )
+        cls.other_patient = User.objects.create_user(
+            username='validation_other', password='testpass123',
+            email='validation_other@example.com', user_type='patient',
+        )
+        cls.items = [
+            InventoryItem.objects.create(
+                name=f'Item {i}', category='supplies', quantity=10, clinic=cls.clinic,
+            )
+            for i in range(5)
+        ]
+        cls.invoices = [cls._invoice(cls.patient, i) for i in range(5)]
+        cls.foreign_invoice = cls._invoice(cls.other_patient, 5)
+
+    @classmethod
+    def _invoice(cls, patient, n):
+        appointment = Appointment.objects.create(
+            patient=patient, service=cls.service, clinic=cls.clinic,
+            date=date(2030, 1, n + 1), time=time(10, 0), status='completed',
+        )
+        return Invoice.objects.create(
+            invoice_number=f'INV-2030-01-{n:04d}', reference_number=f'REF-{n:04d}',
+            appointment=appointment, patient=patient, clinic=cls.clinic,
+            service_charge=Decimal('500.00'),
+            invoice_date=date(2030, 1, 1), due_date=date(2030, 2, 1),
+        )
+
+    def _payment_data(self, allocations, **extra):
+        return {
+            'patient_id': self.patient.id, 'amount': '5000.00',
+            'payment_date': '2030-01-10', 'payment_method': 'cash',
+            'allocations': allocations, **extra,
+        }
+
+    def test_items_validated_with_one_lookup(self):
+        items = [
+            {'inventory_item_id': str(item.id), 'quantity': 1, 'unit_price': 10}
+            for item in self.items
+        ]
+        serializer = InvoiceCreateSerializer()
+        with CaptureQueriesContext(connection) as ctx:
+            validated = serializer.validate_items(items)
+        self.assertEqual(len(ctx), 1)
+        self.assertEqual([item['item_name'] for item in validated], [item.name for item in self.items])
+
+    def test_unknown_inventory_item_rejected(self):
+        serializer = InvoiceCreateSerializer(data={
+            'appointment_id': self.invoices[0].appointment_id, 'service_charge': '100.00',
+            'items': [{'inventory_item_id': 999999, 'quantity': 1, 'unit_price': 10}],
+        })
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('Inventory item 999999 not found', str(serializer.errors['items']))
+
+    def test_allocations_validated_with_one_lookup(self):
+        allocations = [{'invoice_id': invoice.id, 'amount': '100.00'} for invoice in self.invoices]
+        serializer = PaymentRecordSerializer(data=self._payment_data(allocations))
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+        # One query for the patient, one for every referenced invoice
+        self.assertEqual(len(ctx), 2)
+
+    def test_unknown_invoice_rejected(self):
+        serializer = PaymentRecordSerializer(data=self._payment_data(
+            [{'invoice_id': 999999, 'amount': '100.00'}]
+        ))
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('Invoice 999999 not found', str(serializer.errors['allocations']))
+
+    def test_invoices_must_belong_to_patient(self):
+        serializer = PaymentRecordSerializer(data=self._payment_data([
+            {'invoice_id': self.invoices[0].id, 'amount': '100.00'},
+            {'invoice_id': self.foreign_invoice.id, 'amount': '100.00'},
+        ]))
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('same patient', str(serializer.errors))
+
+        serializer = PaymentRecordSerializer(data=self._payment_data(
+            [{'invoice_id': self.foreign_invoice.id, 'amount': '100.00'}]
+        ))
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('do not belong', str(serializer.errors))
+
+    def test_appointment_checked_with_one_query(self):
+        serializer = InvoiceCreateSerializer()
+        with CaptureQueriesContext(connection) as ctx:
+            with self.assertRaisesMessage(ValidationError, 'Invoice already exists for this appointment'):
+                serializer.validate_appointment_id(self.invoices[0].appointment_id)
+        self.assertEqual(len(ctx), 1)
+
+        pending = Appointment.objects.create(
+            patient=self.patient, service=self.service, clinic=self.clinic,
+            date=date(2030, 3, 1), time=time(10, 0), status='confirmed',
+        )
+        with self.assertRaisesMessage(ValidationError, 'Can only create invoice for completed appointments'):
+            serializer.validate_appointment_id(pending.id)
+
+        pending.status = 'completed'
+        pending.save()
+        self.assertEqual(serializer.validate_appointment_id(pending.id), pending.id)
@@ -0,0 +1,97 @@
+"""
+Tests for the dentist availability bulk_create endpoint.
+"""
+
+from datetime import date, time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from api.models import ClinicLocation, DentistAvailability
+
+User = get_user_model()
+
+URL = '/api/dentist-availability/bulk_create/'
+
+
+class DentistAvailabilityBulkCreateTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.clinic = ClinicLocation.objects.create(
+            name='Clinic A', address='Address A', phone='111-1111'
+        )
+        cls.owner = User.objects.create_user(
+            username='bulk_owner', password='testpass123',
+            email='bulk_owner@example.com', user_type='owner',
+        )
+        cls.dentist = User.objects.create_user(
+            username='bulk_dentist', password='testpass123',
+            email='bulk_dentist@example.com', user_type='staff', role='dentist',
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+
+    def _post(self, dates, **extra):
+        payload = {'dentist_id': self.dentist.id, 'dates': dates, **extra}
+        return self.client.post(URL, payload, format='json')
+
+    def test_creates_and_updates_rows(self):
+        DentistAvailability.objects.create(
+            dentist=self.dentist, date=date(2030, 3, 1),
+            start_time=time(9, 0), end_time=time(17, 0),
+        )
+        response = self._post([
+            {'date': '2030-03-01', 'start_time': '10:00:00', 'end_time': '12:00:00'},
+            {'date': '2030-03-02', 'is_available': False},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([row['date'] for row in response.data], ['2030-03-01', '2030-03-02'])
+        self.assertEqual(DentistAvailability.objects.filter(dentist=self.dentist).count(), 2)
+
+        updated = DentistAvailability.objects.get(dentist=self.dentist, date=date(2030, 3, 1))
+        self.assertEqual((updated.start_time, updated.end_time), (time(10, 0), time(12, 0)))
+        created = DentistAvailability.objects.get(dentist=self.dentist, date=date(2030, 3, 2))
+        self.assertFalse(created.is_available)
+        self.assertIsNone(created.clinic)
+
+    def test_clinic_specific_rows_are_separate(self):
+        response = self._post(
+            [{'date': '2030-03-05'}, {'date': '2030-03-05', 'apply_to_all_clinics': True}],
+            clinic_id=self.clinic.id, apply_to_all_clinics=False,
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        rows = DentistAvailability.objects.filter(dentist=self.dentist, date=date(2030, 3, 5))
+        self.assertEqual(sorted(rows.values_list('clinic_id', flat=True), key=str),
+                         sorted([self.clinic.id, None], key=str))
+        self.assertEqual(response.data[0]['clinic_data']['id'], self.clinic.id)
+
+    def test_query_count_independent_of_date_count(self):
+        def run(days):
+            dates = [{'date': f'2030-04-{day:02d}'} for day in days]
+            with CaptureQueriesContext(connection) as ctx:
+                response = self._post(dates)
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            return len(ctx)
+
+        self.assertEqual(run(range(1, 3)), run(range(3, 13)))
+
+    def test_cache_cleared_once_and_errors_do_not_fail_the_write(self):
+        with mock.patch('api.services.cache_service.get_cache') as get_cache:
+            response = self._post([{'date': '2030-05-01'}, {'date': '2030-05-02'}])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        get_cache.return_value.clear.assert_called_once_with()
+
+        with mock.patch('api.services.cache_service.get_cache', side_effect=RuntimeError('down')):
+            response = self._post([{'date': '2030-05-03'}])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(
+            DentistAvailability.objects.filter(dentist=self.dentist, date=date(2030, 5, 3)).exists()
+        )
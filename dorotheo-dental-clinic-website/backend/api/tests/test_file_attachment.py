@@ -0,0 +1,50 @@
+"""
+Tests for FileAttachment.file_size.
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+
+from api.models import FileAttachment
+
+User = get_user_model()
+
+
+class FileAttachmentSizeTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.patient = User.objects.create_user(
+            username='attachment_patient', password='testpass123',
+            email='attachment_patient@example.com', user_type='patient',
+        )
+
+    def _upload(self, content):
+        return SimpleUploadedFile('scan.pdf', content, content_type='application/pdf')
+
+    def test_size_taken_from_upload_not_input(self):
+        attachment = FileAttachment.objects.create(
+            patient=self.patient, title='Scan', file=self._upload(b'12345'), file_size=999,
+        )
+        attachment.refresh_from_db()
+        self.assertEqual(attachment.file_size, 5)
+
+    def test_replacing_file_updates_size(self):
+        attachment = FileAttachment.objects.create(
+            patient=self.patient, title='Scan', file=self._upload(b'12345'),
+        )
+        attachment.file = self._upload(b'1234567890')
+        attachment.save(update_fields=['file'])
+        attachment.refresh_from_db()
+        self.assertEqual(attachment.file_size, 10)
+
+    def test_stored_file_keeps_recorded_size(self):
+        attachment = FileAttachment.objects.create(
+            patient=self.patient, title='Scan', file=self._upload(b'12345'),
+        )
+        attachment = FileAttachment.objects.get(pk=attachment.pk)
+        attachment.title = 'Renamed'
+        attachment.save()
+        attachment.refresh_from_db()
+        self.assertEqual(attachment.file_size, 5)
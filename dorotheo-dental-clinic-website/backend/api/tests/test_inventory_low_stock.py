@@ -0,0 +1,58 @@
+"""
+Tests for the inventory low-stock endpoints.
+"""
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from api.models import ClinicLocation, InventoryItem
+
+User = get_user_model()
+
+
+class InventoryLowStockTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.clinic_a = ClinicLocation.objects.create(
+            name='Clinic A', address='Address A', phone='111-1111'
+        )
+        cls.clinic_b = ClinicLocation.objects.create(
+            name='Clinic B', address='Address B', phone='222-2222'
+        )
+        cls.owner = User.objects.create_user(
+            username='inventory_owner', password='testpass123',
+            email='inventory_owner@example.com', user_type='owner',
+        )
+        for name, quantity, min_stock, clinic in [
+            ('Gloves', 5, 10, cls.clinic_a),     # low
+            ('Masks', 10, 10, cls.clinic_b),     # low (at threshold)
+            ('Gauze', 50, 10, cls.clinic_a),     # ok
+        ]:
+            InventoryItem.objects.create(
+                name=name, category='supplies', quantity=quantity,
+                min_stock=min_stock, clinic=clinic,
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+
+    def test_low_stock_queryset_matches_property(self):
+        expected = {item.name for item in InventoryItem.objects.all() if item.is_low_stock}
+        self.assertEqual(set(InventoryItem.objects.low_stock().values_list('name', flat=True)), expected)
+
+    def test_low_stock_list(self):
+        response = self.client.get('/api/inventory/low_stock/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual({row['name'] for row in response.data}, {'Gloves', 'Masks'})
+        self.assertTrue(all(row['is_low_stock'] for row in response.data))
+
+    def test_low_stock_count(self):
+        response = self.client.get('/api/inventory/low_stock_count/')
+        self.assertEqual(response.data, {'count': 2})
+
+        response = self.client.get('/api/inventory/low_stock_count/', {'clinic_id': self.clinic_a.id})
+        self.assertEqual(response.data, {'count': 1})
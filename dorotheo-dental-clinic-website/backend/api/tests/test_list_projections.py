@@ -0,0 +1,97 @@
+"""
+Tests for the list endpoints that narrow their joined user columns.
+
+Each list renders only names (and a few scalar columns) of the joined rows;
+the projection must not pull whole user rows or trigger per-row reloads of
+deferred fields.
+"""
+
+from datetime import date, time
+from decimal import Decimal
+
+from api.models import (
+    Appointment, AppointmentNotification, Billing, ClinicalNote,
+    DentistNotification, Invoice, TeethImage,
+)
+from api.tests.query_counts import ListQueryCountTestCase
+
+
+class ListProjectionTest(ListQueryCountTestCase):
+
+    def add_row(self, n):
+        appointment = Appointment.objects.create(
+            patient=self.patient, dentist=self.dentist, service=self.service,
+            clinic=self.clinic, date=date(2030, 1, n), time=time(10, 0),
+            status='completed',
+        )
+        Invoice.objects.create(
+            invoice_number=f'INV-2030-01-{n:04d}', reference_number=f'REF-{n:04d}',
+            appointment=appointment, patient=self.patient, clinic=self.clinic,
+            created_by=self.owner, service_charge=Decimal('500.00'),
+            invoice_date=date(2030, 1, n), due_date=date(2030, 2, n),
+        )
+        Billing.objects.create(
+            patient=self.patient, appointment=appointment, clinic=self.clinic,
+            amount=Decimal('500.00'), description='Cleaning', created_by=self.owner,
+        )
+        TeethImage.objects.create(
+            patient=self.patient, image='teeth_images/projection.jpg',
+            uploaded_by=self.dentist, appointment=appointment,
+        )
+        ClinicalNote.objects.create(
+            patient=self.patient, appointment=appointment,
+            content='Note', author=self.dentist,
+        )
+        DentistNotification.objects.create(
+            dentist=self.dentist, appointment=appointment,
+            notification_type='new_appointment', message='New appointment',
+        )
+        AppointmentNotification.objects.create(
+            recipient=self.owner, appointment=appointment,
+            notification_type='new_appointment', message='New appointment',
+        )
+
+    def _assert_projected(self, url, user=None):
+        if user is not None:
+            self.client.force_authenticate(user=user)
+        # Constant query count: no per-row reloads of deferred columns
+        ctx, response = self.assert_queries_constant(url)
+        self.assertFalse([q['sql'] for q in ctx.captured_queries if '"password"' in q['sql']])
+        return self._rows(response)[0]
+
+    def test_invoice_list(self):
+        row = self._assert_projected('/api/invoices/')
+        self.assertEqual(row['patient_name'], 'Pat Patient')
+        self.assertEqual(row['patient_email'], 'list_patient@example.com')
+        self.assertEqual(row['created_by_name'], 'Olive Owner')
+        self.assertEqual(row['dentist_name'], 'Dana Dentist')
+        self.assertEqual(row['service_name'], 'Cleaning')
+
+    def test_billing_list(self):
+        row = self._assert_projected('/api/billing/')
+        self.assertEqual(row['patient_name'], 'Pat Patient')
+        self.assertEqual(row['created_by_name'], 'Olive Owner')
+        self.assertEqual(row['clinic_data']['name'], 'Clinic A')
+
+    def test_teeth_image_list(self):
+        row = self._assert_projected('/api/teeth-images/')
+        self.assertEqual(row['uploaded_by_name'], 'Dana Dentist')
+        self.assertEqual(row['dentist_name'], 'Dana Dentist')
+        self.assertEqual(row['service_name'], 'Cleaning')
+
+    def test_clinical_note_list(self):
+        row = self._assert_projected('/api/clinical-notes/')
+        self.assertEqual(row['patient_name'], 'Pat Patient')
+        self.assertEqual(row['author_name'], 'Dana Dentist')
+
+    def test_dentist_notification_list(self):
+        row = self._assert_projected('/api/notifications/', user=self.dentist)
+        self.assertEqual(row['dentist_name'], 'Dana Dentist')
+        self.assertEqual(row['appointment_details']['patient_name'], 'Pat Patient')
+        self.assertEqual(row['appointment_details']['service'], 'Cleaning')
+
+    def test_appointment_notification_list(self):
+        row = self._assert_projected('/api/appointment-notifications/')
+        self.assertEqual(row['recipient_name'], 'Olive Owner')
+        self.assertEqual(row['appointment_details']['status'], 'completed')
+        self.assertEqual(row['appointment_details']['service_name'], 'Cleaning')
@@ -0,0 +1,54 @@
+"""
+Query-count tests for the notification list endpoints.
+
+get_appointment_details reads appointment, service and reschedule relations
+for every row; the viewsets must join them so list cost does not grow with
+the number of notifications.
+"""
+
+from datetime import date, time
+
+from api.models import Appointment, AppointmentNotification, DentistNotification
+from api.tests.query_counts import ListQueryCountTestCase
+
+
+class NotificationListQueryCountTest(ListQueryCountTestCase):
+    """Notification lists must use a constant number of queries."""
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(user=self.dentist)
+
+    def add_row(self, n):
+        appointment = Appointment.objects.create(
+            patient=self.patient, dentist=self.dentist,
+            service=self.service, clinic=self.clinic,
+            date=date(2030, 1, n), time=time(10, 0),
+            status='reschedule_requested',
+            reschedule_date=date(2030, 2, 1), reschedule_time=time(11, 0),
+            reschedule_service=self.service, reschedule_dentist=self.dentist,
+        )
+        AppointmentNotification.objects.create(
+            recipient=self.dentist, appointment=appointment,
+            notification_type='reschedule_request', message='Reschedule',
+        )
+        DentistNotification.objects.create(
+            dentist=self.dentist, appointment=appointment,
+            notification_type='reschedule_request', message='Reschedule',
+        )
+
+    def test_list_queries_do_not_grow_with_notifications(self):
+        for url in ('/api/appointment-notifications/', '/api/notifications/'):
+            with self.subTest(url=url):
+                AppointmentNotification.objects.all().delete()
+                DentistNotification.objects.all().delete()
+                self.assert_queries_constant(url)
+
+    def test_appointment_details_rendered_from_joined_rows(self):
+        self._add_rows(1)
+        _, response = self._get('/api/appointment-notifications/')
+        details = self._rows(response)[0]['appointment_details']
+        self.assertEqual(details['patient_name'], 'Pat Patient')
+        self.assertEqual(details['service_name'], 'Cleaning')
+        self.assertEqual(details['reschedule_service'], 'Cleaning')
+        self.assertEqual(details['reschedule_dentist'], 'Dana Dentist')
@@ -291,6 +291,24 @@ class PatientPaginationTestCase(TestCase):
             f'Expected <= 15 queries, got {num_queries}'
         )
 
+    def test_query_count_independent_of_page_size(self):
+        """last_appointment_date must not trigger a query per patient."""
+        from django.test.utils import CaptureQueriesContext
+        from django.db import connection
+
+        # Warm up so both requests see settled is_active_patient values
+        self.client.get('/api/users/patients/?page_size=50')
+
+        with CaptureQueriesContext(connection) as small:
+            self.client.get('/api/users/patients/?page_size=5')
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get('/api/users/patients/?page_size=50')
+
+        self.assertEqual(len(small), len(large))
+        results = {p['id']: p for p in response.json()['results']}
+        self.assertIsNotNone(results[self.patients[0].id]['last_appointment_date'])
+        self.assertIsNone(results[self.patients[49].id]['last_appointment_date'])
+
     # --------------------------------------------------
     # patient_stats endpoint
     # --------------------------------------------------
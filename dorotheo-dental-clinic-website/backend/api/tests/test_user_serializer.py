@@ -0,0 +1,51 @@
+"""
+Tests for UserSerializer username validation.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from api.serializers import UserSerializer
+
+User = get_user_model()
+
+
+class UserSerializerUsernameTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='serializer_user', password='testpass123',
+            email='serializer_user@example.com', user_type='patient',
+        )
+        cls.other = User.objects.create_user(
+            username='serializer_other', password='testpass123',
+            email='serializer_other@example.com', user_type='patient',
+        )
+
+    def _user_lookups(self, ctx):
+        return [q['sql'] for q in ctx.captured_queries if 'FROM "api_user"' in q['sql']]
+
+    def test_unchanged_username_skips_lookup(self):
+        serializer = UserSerializer(self.user, data={'username': 'serializer_user'}, partial=True)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(self._user_lookups(ctx), [])
+
+    def test_changed_username_checked_once(self):
+        serializer = UserSerializer(self.user, data={'username': 'serializer_new'}, partial=True)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(len(self._user_lookups(ctx)), 1)
+
+    def test_duplicate_username_rejected(self):
+        serializer = UserSerializer(self.user, data={'username': 'serializer_other'}, partial=True)
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.errors['username'], ['This username is already taken'])
+
+    def test_invalid_characters_rejected(self):
+        serializer = UserSerializer(self.user, data={'username': 'bad name!'}, partial=True)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('username', serializer.errors)
@@ -9,7 +9,7 @@ from django_ratelimit.decorators import ratelimit
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
 from django.core.mail import send_mail
-from django.db.models import Sum, Count, Q, F, Prefetch, Max, Exists, OuterRef
+from django.db.models import Sum, Count, Q, F, Prefetch, Exists, OuterRef
 from django.utils import timezone
 from django.conf import settings
 from datetime import date, timedelta
@@ -189,6 +189,7 @@ from .audit_service import create_audit_log, get_client_ip, get_user_agent
 
 # Import audit decorators
 from .decorators import log_patient_access, log_export, log_search
+from .signals import _clear_chatbot_cache
 
 from .models import (
     User, Service, Appointment, DentalRecord,
@@ -196,7 +197,8 @@ from .models import (
     TreatmentPlan, TeethImage, StaffAvailability, DentistAvailability, DentistNotification,
     AppointmentNotification, PasswordResetToken, PatientIntakeForm,
     FileAttachment, ClinicalNote, TreatmentAssignment, BlockedTimeSlot,
-    Invoice, InvoiceItem, PatientBalance, Payment, PaymentSplit
+    Invoice, InvoiceItem, PatientBalance, Payment, PaymentSplit,
+    only_joined, user_name_fields
 )
 from .serializers import (
     UserSerializer, ServiceSerializer, AppointmentSerializer,
@@ -207,7 +209,7 @@ from .serializers import (
     PasswordResetTokenSerializer, PatientIntakeFormSerializer,
     FileAttachmentSerializer, ClinicalNoteSerializer, TreatmentAssignmentSerializer, BlockedTimeSlotSerializer,
     InvoiceSerializer, InvoiceItemSerializer, InvoiceCreateSerializer, PatientBalanceSerializer,
-    PaymentSerializer, PaymentSplitSerializer, PaymentRecordSerializer
+    PaymentSerializer, PaymentSplitSerializer, PaymentRecordSerializer, excluded_fields
 )
 
 
@@ -245,18 +247,13 @@ def create_appointment_notification(appointment, notification_type, custom_messa
     # Get all staff and owner users
     recipients = User.objects.filter(Q(user_type='staff') | Q(user_type='owner'))
     
-    # Create notification for each recipient
-    notifications_created = []
-    for recipient in recipients:
-        notification = AppointmentNotification.objects.create(
-            recipient=recipient,
-            appointment=appointment,
-            notification_type=notification_type,
-            message=custom_message
-        )
-        notifications_created.append(notification)
-    
-    return notifications_created
+    # Create notification for each recipient in a single batched insert
+    return AppointmentNotification.broadcast(
+        recipients,
+        appointment=appointment,
+        notification_type=notification_type,
+        message=custom_message
+    )
 
 
 def create_patient_notification(appointment, notification_type, custom_message=None):
@@ -493,9 +490,13 @@ def reset_password(request):
         return Response({'error': exc.messages[0]}, status=status.HTTP_400_BAD_REQUEST)
     
     try:
-        reset_token = PasswordResetToken.objects.get(token=token)
+        reset_token = PasswordResetToken.objects.select_related('user').get(token=token)
         
-        if not reset_token.is_valid():
+        # Validate and mark the token as used in a single conditional UPDATE
+        claimed = PasswordResetToken.objects.filter(
+            pk=reset_token.pk, is_used=False, expires_at__gt=timezone.now()
+        ).update(is_used=True)
+        if not claimed:
             return Response(
                 {'error': 'Token has expired or been used'},
                 status=status.HTTP_400_BAD_REQUEST
@@ -506,10 +507,6 @@ def reset_password(request):
         user.set_password(new_password)
         user.save()
         
-        # Mark token as used
-        reset_token.is_used = True
-        reset_token.save()
-        
         # Send confirmation email
         try:
             send_password_reset_confirmation(user)
@@ -543,6 +540,21 @@ def current_user(request):
 
 
 
+def last_appointment_prefetch():
+    """
+    Prefetch each user's most recent completed appointment into
+    ``last_appointment_cache`` so UserSerializer.get_last_appointment_date
+    never queries per row. Costs one extra query for the whole page.
+    """
+    return Prefetch(
+        'appointments',
+        queryset=Appointment.objects.filter(
+            status='completed'
+        ).order_by('-completed_at', '-date', '-time')[:1],
+        to_attr='last_appointment_cache'
+    )
+
+
 class UserViewSet(AuditContextMixin, viewsets.ModelViewSet):
     queryset = User.objects.all().order_by('id')
     serializer_class = UserSerializer
@@ -553,7 +565,9 @@ class UserViewSet(AuditContextMixin, viewsets.ModelViewSet):
         Override to add selective search logging.
         Only logs patient-specific searches (IDs, full names, emails).
         """
-        queryset = super().get_queryset()
+        queryset = super().get_queryset().select_related(
+            'assigned_clinic'
+        ).prefetch_related(last_appointment_prefetch())
         
         # Check for search query parameter
         search_query = self.request.query_params.get('search', '').strip()
@@ -700,15 +714,8 @@ class UserViewSet(AuditContextMixin, viewsets.ModelViewSet):
             patients = queryset.select_related(
                 'assigned_clinic'  # JOIN for clinic data (1 query)
             ).prefetch_related(
-                Prefetch(
-                    'appointments',
-                    queryset=Appointment.objects.filter(
-                        status='completed'
-                    ).select_related('service', 'dentist').order_by('-completed_at', '-date', '-time')[:1],
-                    to_attr='last_appointment_cache'
-                )
+                last_appointment_prefetch()  # Last completed appointment (1 query per page)
             ).annotate(
-                last_completed_appointment=Max('appointments__completed_at'),
                 has_recent_appointment=Exists(active_subquery),
                 has_any_completed_appointment=Exists(any_completed_subquery)
             )
@@ -755,7 +762,9 @@ class UserViewSet(AuditContextMixin, viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def staff(self, request):
-        staff = User.objects.filter(user_type__in=['staff', 'owner'], is_archived=False)
+        staff = User.objects.filter(
+            user_type__in=['staff', 'owner'], is_archived=False
+        ).select_related('assigned_clinic')
         serializer = self.get_serializer(staff, many=True)
         return Response(serializer.data)
 
@@ -823,10 +832,11 @@ class UserViewSet(AuditContextMixin, viewsets.ModelViewSet):
 
         if user.user_type == 'patient':
             # Check for outstanding balance before archiving
-            outstanding = Invoice.objects.filter(
-                patient=user
-            ).exclude(status='paid').exclude(status='cancelled')
-            total_balance = sum(inv.balance for inv in outstanding if inv.balance and inv.balance > 0)
+            total_balance = Invoice.objects.filter(
+                patient=user, balance__gt=0
+            ).exclude(status__in=['paid', 'cancelled']).aggregate(
+                total=Sum('balance')
+            )['total'] or 0
             if total_balance > 0:
                 return Response(
                     {'error': f'Cannot archive patient. They have an outstanding balance of ₱{total_balance:,.2f}. Please clear the balance first.'},
@@ -881,7 +891,9 @@ class UserViewSet(AuditContextMixin, viewsets.ModelViewSet):
         """Get all archived patients with pagination"""
         archived = User.objects.filter(
             user_type='patient', is_archived=True
-        ).select_related('assigned_clinic').order_by('date_joined', 'id')
+        ).select_related('assigned_clinic').prefetch_related(
+            last_appointment_prefetch()
+        ).order_by('date_joined', 'id')
 
         paginator = PageNumberPagination()
         paginator.page_size = int(request.query_params.get('page_size', 20))
@@ -1028,7 +1040,8 @@ class ServiceViewSet(AuditContextMixin, viewsets.ModelViewSet):
             serializer.save()
 
     def get_queryset(self):
-        queryset = Service.objects.all().order_by('name')
+        # Prefetch the M2M so clinics_data costs one query per page, not per row
+        queryset = Service.objects.prefetch_related('clinics').order_by('name')
         
         # Filter by clinic_id if provided in query params
         clinic_id = self.request.query_params.get('clinic_id', None)
@@ -1063,10 +1076,9 @@ class ServiceViewSet(AuditContextMixin, viewsets.ModelViewSet):
         category = request.query_params.get('category', 'all')
         clinic_id = request.query_params.get('clinic_id', None)
         
-        if category == 'all':
-            services = Service.objects.all()
-        else:
-            services = Service.objects.filter(category=category)
+        services = Service.objects.prefetch_related('clinics')
+        if category != 'all':
+            services = services.filter(category=category)
         
         # Filter by clinic if provided
         if clinic_id is not None:
@@ -1090,7 +1102,10 @@ class AppointmentViewSet(AuditContextMixin, viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
-        queryset = Appointment.objects.all()
+        if self.action == 'list':
+            queryset = Appointment.objects.for_list()
+        else:
+            queryset = Appointment.objects.with_related()
         
         # Filter by user type
         if user.user_type == 'patient':
@@ -1508,7 +1523,7 @@ class AppointmentViewSet(AuditContextMixin, viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def today(self, request):
-        today_appointments = Appointment.objects.filter(date=date.today())
+        today_appointments = Appointment.objects.for_list().filter(date=date.today())
         serializer = self.get_serializer(today_appointments, many=True)
         return Response(serializer.data)
 
@@ -1836,7 +1851,7 @@ class AppointmentViewSet(AuditContextMixin, viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def upcoming(self, request):
-        upcoming = Appointment.objects.filter(date__gte=date.today(), status__in=['confirmed', 'reschedule_requested', 'cancel_requested'])
+        upcoming = Appointment.objects.for_list().filter(date__gte=date.today(), status__in=['confirmed', 'reschedule_requested', 'cancel_requested'])
         serializer = self.get_serializer(upcoming, many=True)
         return Response(serializer.data)
 
@@ -1925,7 +1940,8 @@ class InventoryItemViewSet(AuditContextMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        queryset = InventoryItem.objects.all().order_by('name')
+        # clinic_name / clinic_data read the clinic
+        queryset = InventoryItem.objects.select_related('clinic').order_by('name')
         
         # Filter by clinic if provided
         clinic_id = self.request.query_params.get('clinic_id', None)
@@ -1981,14 +1997,13 @@ class InventoryItemViewSet(AuditContextMixin, viewsets.ModelViewSet):
         message = f"Low Stock Alert: {inventory_item.name} (Category: {inventory_item.category}) has only {inventory_item.quantity} units left."
         
         # Create notification for each recipient
-        for recipient in recipients:
-            notification = AppointmentNotification.objects.create(
-                recipient=recipient,
-                appointment=None,  # No appointment associated
-                notification_type='inventory_alert',
-                message=message
-            )
-            print(f"[INVENTORY] Created notification {notification.id} for {recipient.email}")
+        notifications = AppointmentNotification.broadcast(
+            recipients,
+            appointment=None,  # No appointment associated
+            notification_type='inventory_alert',
+            message=message
+        )
+        print(f"[INVENTORY] Created {len(notifications)} low stock notifications")
     
     def create_restock_notification(self, inventory_item):
         """Create notification when inventory item is restocked"""
@@ -2001,14 +2016,13 @@ class InventoryItemViewSet(AuditContextMixin, viewsets.ModelViewSet):
         message = f"{inventory_item.name} has been restocked! Current quantity: {inventory_item.quantity} units."
         
         # Create notification for each recipient
-        for recipient in recipients:
-            notification = AppointmentNotification.objects.create(
-                recipient=recipient,
-                appointment=None,
-                notification_type='inventory_restock',
-                message=message
-            )
-            print(f"[INVENTORY] Created restock notification {notification.id} for {recipient.email}")
+        notifications = AppointmentNotification.broadcast(
+            recipients,
+            appointment=None,
+            notification_type='inventory_restock',
+            message=message
+        )
+        print(f"[INVENTORY] Created {len(notifications)} restock notifications")
     
     def perform_create(self, serializer):
         """Check for low stock after creating inventory item"""
@@ -2041,7 +2055,7 @@ class InventoryItemViewSet(AuditContextMixin, viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def low_stock(self, request):
-        low_stock_items = [item for item in InventoryItem.objects.all() if item.is_low_stock]
+        low_stock_items = InventoryItem.objects.low_stock().select_related('clinic')
         serializer = self.get_serializer(low_stock_items, many=True)
         return Response(serializer.data)
     
@@ -2055,8 +2069,7 @@ class InventoryItemViewSet(AuditContextMixin, viewsets.ModelViewSet):
                 queryset = queryset.filter(clinic_id=int(clinic_id))
             except (ValueError, TypeError):
                 pass
-        low_stock_items = [item for item in queryset if item.is_low_stock]
-        return Response({'count': len(low_stock_items)})
+        return Response({'count': queryset.low_stock().count()})
 
 
 class BillingViewSet(AuditContextMixin, viewsets.ModelViewSet):
@@ -2073,7 +2086,9 @@ class BillingViewSet(AuditContextMixin, viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
-        queryset = Billing.objects.all()
+        queryset = Billing.objects.select_related('patient', 'created_by', 'clinic')
+        if self.action == 'list':
+            queryset = only_joined(queryset, *user_name_fields('patient', 'created_by'))
         
         # Filter by patient if user is a patient
         if user.user_type == 'patient':
@@ -2149,7 +2164,17 @@ class TeethImageViewSet(AuditContextMixin, viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
-        queryset = TeethImage.objects.all()
+        queryset = TeethImage.objects.select_related(
+            'patient', 'uploaded_by', 'appointment__service', 'appointment__dentist'
+        )
+        if self.action == 'list':
+            queryset = only_joined(
+                queryset,
+                *user_name_fields('patient', 'uploaded_by', 'appointment__dentist'),
+                'appointment__date', 'appointment__time',
+                'appointment__service', 'appointment__dentist',
+                'appointment__service__name',
+            )
         
         # Filter by patient if user is a patient
         if user.user_type == 'patient':
@@ -2214,7 +2239,9 @@ class TeethImageViewSet(AuditContextMixin, viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
         
-        images = TeethImage.objects.filter(patient_id=patient_id)
+        images = TeethImage.objects.filter(patient_id=patient_id).select_related(
+            'patient', 'uploaded_by', 'appointment__service', 'appointment__dentist'
+        )
         serializer = self.get_serializer(images, many=True)
         return Response(serializer.data)
 
@@ -2331,7 +2358,7 @@ class StaffAvailabilityViewSet(AuditContextMixin, viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Filter by staff member and/or clinic if specified"""
-        queryset = StaffAvailability.objects.all()
+        queryset = StaffAvailability.objects.select_related('staff').prefetch_related('clinics')
         staff_id = self.request.query_params.get('staff_id', None)
         clinic_id = self.request.query_params.get('clinic_id', None)
         
@@ -2390,7 +2417,7 @@ class StaffAvailabilityViewSet(AuditContextMixin, viewsets.ModelViewSet):
                         availability.clinics.set(day_clinic_ids)
             
             # Return updated availability
-            availability = StaffAvailability.objects.filter(staff=staff)
+            availability = StaffAvailability.objects.filter(staff=staff).select_related('staff').prefetch_related('clinics')
             serializer = self.get_serializer(availability, many=True)
             return Response(serializer.data)
         
@@ -2423,7 +2450,7 @@ class StaffAvailabilityViewSet(AuditContextMixin, viewsets.ModelViewSet):
             queryset = StaffAvailability.objects.filter(
                 day_of_week=day_of_week,
                 is_available=True
-            ).select_related('staff')
+            ).select_related('staff').prefetch_related('clinics')
             
             # Filter by clinic if specified
             if clinic_id:
@@ -2530,34 +2557,42 @@ class DentistAvailabilityViewSet(AuditContextMixin, viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            created_availability = []
-            
-            # Update or create availability for each date
+            # Resolve every requested clinic in one query
+            clinic_ids = {
+                date_data.get('clinic_id', default_clinic_id)
+                for date_data in dates_data
+                if date_data.get('clinic_id', default_clinic_id)
+                and not date_data.get('apply_to_all_clinics', default_apply_to_all)
+            }
+            clinics = ClinicLocation.objects.in_bulk(clinic_ids)
+
+            entries = []
             for date_data in dates_data:
                 # Determine clinic settings for this date
                 date_clinic_id = date_data.get('clinic_id', default_clinic_id)
                 apply_to_all = date_data.get('apply_to_all_clinics', default_apply_to_all)
                 
-                # Get clinic object if specified
+                # Unknown clinic ids fall back to an all-clinics row
                 clinic = None
                 if date_clinic_id and not apply_to_all:
-                    try:
-                        clinic = ClinicLocation.objects.get(id=date_clinic_id)
-                    except ClinicLocation.DoesNotExist:
-                        pass
+                    clinic = clinics.get(int(date_clinic_id))
                 
-                availability, created = DentistAvailability.objects.update_or_create(
-                    dentist=dentist,
-                    date=date_data['date'],
-                    clinic=clinic,
-                    defaults={
-                        'start_time': date_data.get('start_time', '09:00:00'),
-                        'end_time': date_data.get('end_time', '17:00:00'),
-                        'is_available': date_data.get('is_available', True),
-                        'apply_to_all_clinics': apply_to_all,
-                    }
+                entries.append({
+                    'date': date_data['date'],
+                    'clinic': clinic,
+                    'start_time': date_data.get('start_time', '09:00:00'),
+                    'end_time': date_data.get('end_time', '17:00:00'),
+                    'is_available': date_data.get('is_available', True),
+                    'apply_to_all_clinics': apply_to_all,
+                })
+            
+            # Batched create/update instead of an update_or_create per date
+            created_availability = DentistAvailability.upsert_many(dentist, entries)
+            # Bulk writes skip the post_save receiver that normally clears it
+            if created_availability:
+                _clear_chatbot_cache(
+                    f"DentistAvailability bulk upsert (dentist={dentist.id}, rows={len(created_availability)})"
                 )
-                created_availability.append(availability)
             
             serializer = self.get_serializer(created_availability, many=True)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -2704,21 +2739,26 @@ class DentistNotificationViewSet(AuditContextMixin, viewsets.ModelViewSet):
         """Dentists only see their own notifications"""
         user = self.request.user
         if user.user_type == 'staff' and user.role == 'dentist':
-            return DentistNotification.objects.filter(dentist=user).select_related(
-                'dentist',
-                'appointment',
-                'appointment__patient',
-                'appointment__service'
-            ).order_by('-created_at')
+            queryset = DentistNotification.objects.filter(dentist=user)
         elif user.user_type == 'owner':
             # Owner can see all notifications
-            return DentistNotification.objects.all().select_related(
-                'dentist',
-                'appointment',
-                'appointment__patient',
-                'appointment__service'
-            ).order_by('-created_at')
-        return DentistNotification.objects.none()
+            queryset = DentistNotification.objects.all()
+        else:
+            return DentistNotification.objects.none()
+        queryset = queryset.select_related(
+            'dentist',
+            'appointment',
+            'appointment__service'
+        ).order_by('-created_at')
+        if self.action == 'list':
+            # Only the columns DentistNotificationSerializer renders
+            queryset = only_joined(
+                queryset,
+                *user_name_fields('dentist'),
+                'appointment__patient_full_name', 'appointment__date', 'appointment__time',
+                'appointment__service', 'appointment__service__name',
+            )
+        return queryset
 
     @action(detail=True, methods=['post'])
     def mark_read(self, request, pk=None):
@@ -2760,15 +2800,28 @@ class AppointmentNotificationViewSet(AuditContextMixin, viewsets.ModelViewSet):
     def get_queryset(self):
         """Return notifications for the current user (staff, owner, or patient)"""
         user = self.request.user
-        # Use select_related to optimize queries and prevent N+1 problems
-        return AppointmentNotification.objects.filter(recipient=user).select_related(
+        # Use select_related to optimize queries and prevent N+1 problems.
+        # The patient is not joined: serializers read appointment.patient_full_name.
+        queryset = AppointmentNotification.objects.filter(recipient=user).select_related(
             'recipient', 
             'appointment',
-            'appointment__patient',
             'appointment__service',
             'appointment__reschedule_service',
             'appointment__reschedule_dentist'
         ).order_by('-created_at')
+        if self.action == 'list':
+            # Only the columns AppointmentNotificationSerializer renders
+            queryset = only_joined(
+                queryset,
+                *user_name_fields('recipient', 'appointment__reschedule_dentist'),
+                'appointment__patient_full_name', 'appointment__date', 'appointment__time',
+                'appointment__status', 'appointment__cancel_reason',
+                'appointment__reschedule_date', 'appointment__reschedule_time',
+                'appointment__service', 'appointment__reschedule_service',
+                'appointment__reschedule_dentist',
+                'appointment__service__name', 'appointment__reschedule_service__name',
+            )
+        return queryset
 
     @action(detail=True, methods=['post'])
     def mark_read(self, request, pk=None):
@@ -2856,10 +2909,8 @@ class FileAttachmentViewSet(AuditContextMixin, viewsets.ModelViewSet):
         return FileAttachment.objects.none()
 
     def perform_create(self, serializer):
-        """Set file size and uploaded_by automatically"""
-        uploaded_file = self.request.FILES.get('file')
-        file_size = uploaded_file.size if uploaded_file else 0
-        serializer.save(uploaded_by=self.request.user, file_size=file_size)
+        """Set uploaded_by automatically (file_size is filled in by the model)"""
+        serializer.save(uploaded_by=self.request.user)
 
     @action(detail=False, methods=['get'])
     def by_patient(self, request):
@@ -2888,14 +2939,22 @@ class ClinicalNoteViewSet(AuditContextMixin, viewsets.ModelViewSet):
     def get_queryset(self):
         """Filter based on user role"""
         user = self.request.user
+        notes = ClinicalNote.objects.select_related('patient', 'author', 'appointment')
+        if self.action == 'list':
+            notes = self._for_list(notes)
         if user.user_type == 'patient':
             # Patients can only see their own notes (read-only)
-            return ClinicalNote.objects.filter(patient=user)
+            return notes.filter(patient=user)
         elif user.user_type in ['staff', 'owner']:
             # Staff and owner can see all notes
-            return ClinicalNote.objects.all()
+            return notes
         return ClinicalNote.objects.none()
 
+    @staticmethod
+    def _for_list(notes):
+        """Only the joined columns ClinicalNoteSerializer renders."""
+        return only_joined(notes, *user_name_fields('patient', 'author'), 'appointment__date')
+
     def perform_create(self, serializer):
         """Set author automatically"""
         serializer.save(author=self.request.user)
@@ -2907,7 +2966,9 @@ class ClinicalNoteViewSet(AuditContextMixin, viewsets.ModelViewSet):
         if not patient_id:
             return Response({'error': 'patient_id required'}, status=status.HTTP_400_BAD_REQUEST)
         
-        notes = ClinicalNote.objects.filter(patient_id=patient_id)
+        notes = self._for_list(ClinicalNote.objects.filter(patient_id=patient_id).select_related(
+            'patient', 'author', 'appointment'
+        ))
         serializer = self.get_serializer(notes, many=True)
         return Response(serializer.data)
 
@@ -3093,10 +3154,12 @@ class InvoiceViewSet(AuditContextMixin, viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter invoices based on user role and query parameters"""
-        queryset = Invoice.objects.select_related(
-            'patient', 'clinic', 'created_by', 'appointment',
-            'appointment__service', 'appointment__dentist'
-        ).prefetch_related('items', 'items__inventory_item')
+        # ?exclude=items skips the nested items and their prefetch
+        include_items = 'items' not in excluded_fields(self.request)
+        if self.action == 'list':
+            queryset = Invoice.objects.for_list(include_items=include_items)
+        else:
+            queryset = Invoice.objects.for_serializer(include_items=include_items)
         
         user = self.request.user
         
@@ -3146,7 +3209,7 @@ class InvoiceViewSet(AuditContextMixin, viewsets.ModelViewSet):
             generate_invoice_number,
             generate_reference_number,
             calculate_invoice_totals,
-            update_patient_balance,
+            refresh_patient_balance,
             deduct_inventory_items,
             calculate_due_date
         )
@@ -3218,16 +3281,7 @@ class InvoiceViewSet(AuditContextMixin, viewsets.ModelViewSet):
                     deduct_inventory_items(data['items'])
                 
                 # Update patient balance
-                update_patient_balance(
-                    patient_id=appointment.patient.id,
-                    invoice_amount=invoice.total_due,
-                    operation='add'
-                )
-                
-                # Update last_invoice_date
-                patient_balance = PatientBalance.objects.get(patient=appointment.patient)
-                patient_balance.last_invoice_date = invoice_date
-                patient_balance.save()
+                refresh_patient_balance(appointment.patient_id)
                 
                 # Send email notification with PDF attachment
                 email_sent = False
@@ -3294,9 +3348,7 @@ class InvoiceViewSet(AuditContextMixin, viewsets.ModelViewSet):
             )
             
             # Get all invoices for this patient
-            invoices = Invoice.objects.filter(patient=patient).select_related(
-                'clinic', 'appointment', 'appointment__service'
-            ).prefetch_related('items').order_by('-created_at')
+            invoices = Invoice.objects.filter(patient=patient).for_serializer().order_by('-created_at')
             
             # Calculate overdue amount
             overdue_amount = invoices.filter(
@@ -3392,9 +3444,7 @@ class PaymentViewSet(AuditContextMixin, viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter payments based on user role and query parameters"""
-        queryset = Payment.objects.select_related(
-            'patient', 'clinic', 'recorded_by', 'voided_by'
-        ).prefetch_related('splits', 'splits__invoice')
+        queryset = Payment.objects.with_related()
         
         user = self.request.user
         
@@ -3463,6 +3513,7 @@ class PaymentViewSet(AuditContextMixin, viewsets.ModelViewSet):
         }
         """
         from django.db import transaction
+        from .invoice_utils import refresh_patient_balance
         from datetime import date
         
         # Validate input data
@@ -3516,35 +3567,16 @@ class PaymentViewSet(AuditContextMixin, viewsets.ModelViewSet):
                     recorded_by=request.user
                 )
                 
-                # Create payment splits and update invoices
-                for allocation in data['allocations']:
-                    invoice = Invoice.objects.get(id=allocation['invoice_id'])
-                    
-                    # Create payment split
-                    PaymentSplit.objects.create(
-                        payment=payment,
-                        invoice=invoice,
-                        amount=allocation['amount'],
-                        provider_id=allocation.get('provider_id')
-                    )
-                    
-                    # Update invoice payment status
-                    invoice.update_payment_status()
+                # Create payment splits (invoices were validated by the serializer)
+                PaymentSplit.objects.create_splits(payment, data['allocations'])
                 
-                # Update patient balance
-                patient_balance, created = PatientBalance.objects.get_or_create(
-                    patient=patient,
-                    defaults={
-                        'total_invoiced': 0,
-                        'total_paid': 0,
-                        'current_balance': 0
-                    }
+                # Update payment status of all allocated invoices in bulk
+                Invoice.objects.refresh_balances(
+                    [allocation['invoice_id'] for allocation in data['allocations']]
                 )
                 
-                patient_balance.total_paid += data['amount']
-                patient_balance.current_balance = patient_balance.total_invoiced - patient_balance.total_paid
-                patient_balance.last_payment_date = data['payment_date']
-                patient_balance.save()
+                # Update patient balance
+                refresh_patient_balance(patient.id)
                 
                 # Send payment receipt email to patient
                 try:
@@ -3595,6 +3627,7 @@ class PaymentViewSet(AuditContextMixin, viewsets.ModelViewSet):
         }
         """
         from django.db import transaction
+        from .invoice_utils import refresh_patient_balance
         
         try:
             payment = self.get_object()
@@ -3614,26 +3647,21 @@ class PaymentViewSet(AuditContextMixin, viewsets.ModelViewSet):
             
             with transaction.atomic():
                 # Mark payment as voided
+                now = timezone.now()
                 payment.is_voided = True
-                payment.voided_at = timezone.now()
+                payment.voided_at = now
                 payment.voided_by = request.user
                 payment.void_reason = reason
-                payment.save()
+                payment.save(update_fields=['is_voided', 'voided_at', 'voided_by', 'void_reason', 'updated_at'])
                 
                 # Mark all splits as voided and update invoices
-                for split in payment.splits.all():
-                    split.is_voided = True
-                    split.voided_at = timezone.now()
-                    split.save()
-                    
-                    # Update invoice payment status
-                    split.invoice.update_payment_status()
+                invoice_ids = list(payment.splits.values_list('invoice_id', flat=True))
+                # update() skips auto_now, so updated_at is set explicitly
+                payment.splits.update(is_voided=True, voided_at=now, updated_at=now)
+                Invoice.objects.refresh_balances(invoice_ids)
                 
                 # Update patient balance
-                patient_balance = PatientBalance.objects.get(patient=payment.patient)
-                patient_balance.total_paid -= payment.amount
-                patient_balance.current_balance = patient_balance.total_invoiced - patient_balance.total_paid
-                patient_balance.save()
+                refresh_patient_balance(payment.patient_id)
                 
                 # Return response
                 payment_serializer = PaymentSerializer(payment, context={'request': request})
@@ -3642,11 +3670,6 @@ class PaymentViewSet(AuditContextMixin, viewsets.ModelViewSet):
                     'message': 'Payment voided successfully'
                 })
                 
-        except PatientBalance.DoesNotExist:
-            return Response(
-                {'error': 'Patient balance record not found'},
-                status=status.HTTP_404_NOT_FOUND
-            )
         except Exception as e:
             logger.error(f"Error voiding payment: {str(e)}")
             return Response(
@@ -3667,11 +3690,7 @@ class PaymentViewSet(AuditContextMixin, viewsets.ModelViewSet):
             # Get all payments for this patient
             payments = Payment.objects.filter(
                 patient=patient
-            ).select_related(
-                'clinic', 'recorded_by', 'voided_by'
-            ).prefetch_related(
-                'splits', 'splits__invoice'
-            ).order_by('-payment_date', '-created_at')
+            ).with_related().order_by('-payment_date', '-created_at')
             
             # Calculate summary statistics
             active_payments = payments.filter(is_voided=False)
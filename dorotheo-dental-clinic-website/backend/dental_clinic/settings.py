@@ -123,6 +123,9 @@ else:
     MEDIA_URL = '/media/'
     MEDIA_ROOT = BASE_DIR / 'media'
 
+# Test runs upload into a temporary MEDIA_ROOT instead of the tracked media/ folder
+TEST_RUNNER = 'api.test_runner.TempMediaRootRunner'
+
 # ============================================
 # CACHING CONFIGURATION
 # ============================================
@@ -344,6 +347,11 @@ EMAIL_BACKEND = os.environ.get(
 # Resend API Configuration (for Railway - bypasses blocked SMTP)
 RESEND_API_KEY = os.environ.get('RESEND_API_KEY', '')
 
+# Max Resend requests in flight at once for multi-message sends. This caps
+# concurrency only: it does not throttle to Resend's per-second rate limit,
+# and 429 responses are not retried.
+RESEND_MAX_CONCURRENCY = int(os.environ.get('RESEND_MAX_CONCURRENCY', '2'))
+
 # SMTP Configuration (for platforms that allow SMTP)
 EMAIL_HOST = os.environ.get('EMAIL_HOST', 'smtp.gmail.com')
 EMAIL_PORT = int(os.environ.get('EMAIL_PORT', '587'))
@@ -416,6 +424,9 @@ RAG_SIMILARITY_THRESHOLD = float(os.environ.get('RAG_SIMILARITY_THRESHOLD', '0.5
 # Maximum context tokens to inject into AI prompt
 RAG_MAX_CONTEXT_TOKENS = int(os.environ.get('RAG_MAX_CONTEXT_TOKENS', '1500'))
 
+# Seconds to cache retrieved context per normalized question (0 disables)
+RAG_CONTEXT_CACHE_TTL = int(os.environ.get('RAG_CONTEXT_CACHE_TTL', '300'))
+
 # ============================================
 # LOGGING CONFIGURATION
 # ============================================
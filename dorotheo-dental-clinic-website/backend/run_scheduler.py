@@ -42,6 +42,15 @@ def send_low_stock_alerts():
     except Exception as e:
         print(f"✗ Error: {e}\n")
 
+def expire_password_reset_tokens():
+    """Expire stale password reset tokens"""
+    print(f"[{datetime.now()}] Expiring password reset tokens...")
+    try:
+        call_command('expire_password_reset_tokens')
+        print("✓ Password reset token cleanup completed\n")
+    except Exception as e:
+        print(f"✗ Error: {e}\n")
+
 # Schedule tasks
 # For testing: use shorter intervals
 # schedule.every(5).minutes.do(send_appointment_reminders)
@@ -52,6 +61,7 @@ def send_low_stock_alerts():
 schedule.every().day.at("09:00").do(send_appointment_reminders)
 schedule.every().monday.at("10:00").do(send_payment_reminders)
 schedule.every().day.at("08:00").do(send_low_stock_alerts)
+schedule.every().hour.do(expire_password_reset_tokens)
 
 print("=" * 60)
 print("📅 LOCAL DEVELOPMENT TASK SCHEDULER")
@@ -60,6 +70,7 @@ print("Scheduled tasks:")
 print("  • Appointment Reminders: Daily at 9:00 AM")
 print("  • Payment Reminders: Monday at 10:00 AM")
 print("  • Low Stock Alerts: Daily at 8:00 AM")
+print("  • Password Reset Token Cleanup: Hourly")
 print("=" * 60)
 print("⏰ Scheduler is running... Press Ctrl+C to stop")
 print("=" * 60 + "\n")
@@ -41,7 +41,9 @@ ORDER BY ordinal_position;
 SELECT indexname, indexdef
 FROM pg_indexes
 WHERE tablename = 'api_pagechunk';
--- Should show pagechunk_embedding_cosine_idx using hnsw.
+-- Should show pagechunk_embedding_half_idx using hnsw on embedding::halfvec
+-- (pgvector >= 0.7, migration 0054), or pagechunk_embedding_cosine_idx on
+-- older pgvector.
 
 
 -- ── STEP 5: Create match_page_chunks SQL function ─────────────────────────
@@ -126,11 +128,11 @@ CREATE POLICY "No public access to page chunks"
 -- If you re-run the RAG indexer and add many chunks at once,
 -- rebuild the index for optimal performance:
 
--- REINDEX INDEX CONCURRENTLY pagechunk_embedding_cosine_idx;
+-- REINDEX INDEX CONCURRENTLY pagechunk_embedding_half_idx;
 
 -- Or rebuild with hnsw if you have many chunks:
--- DROP INDEX IF EXISTS pagechunk_embedding_cosine_idx;
--- CREATE INDEX pagechunk_embedding_cosine_idx
+-- DROP INDEX IF EXISTS pagechunk_embedding_half_idx;
+-- CREATE INDEX pagechunk_embedding_half_idx
 --   ON api_pagechunk
---   USING hnsw (embedding vector_cosine_ops)
+--   USING hnsw ((embedding::halfvec(768)) halfvec_cosine_ops)
 --   WITH (m = 16, ef_construction = 64);
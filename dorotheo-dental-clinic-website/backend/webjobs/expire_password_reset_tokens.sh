@@ -0,0 +1,12 @@
+#!/bin/bash
+# Azure WebJob: Expire Password Reset Tokens
+# Runs hourly at scheduled time
+
+echo "Starting Expire Password Reset Tokens WebJob..."
+echo "Time: $(date)"
+
+cd /home/site/wwwroot/dorotheo-dental-clinic-website/backend
+python manage.py expire_password_reset_tokens
+
+echo "Expire Password Reset Tokens WebJob completed"
+echo "Time: $(date)"